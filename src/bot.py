@@ -1,56 +1,99 @@
+import asyncio
 import os
 import logging
 import pkgutil
+import signal
 import aiohttp
 import motor.motor_asyncio
-import redis
+import redis.asyncio as aioredis
 import discord
-import sentry_sdk
 import time
 
-from discord.ext import commands, tasks
-from logging.handlers import RotatingFileHandler
-from rgbprint import gradient_print, Color
+from discord.ext import commands
 from dotenv import load_dotenv
+from src.utils.cache import InstrumentedRedis
+from src.utils.cluster import ClusterStats
+from src.utils.health import HealthMonitor, Heartbeat
+from src.utils.help import HelpCatalog
+from src.utils.logs import console_info, console_error, setup_logging, stop_logging
+from src.utils.memory import member_cache_flags
+from src.utils.metrics import (
+    COMMAND_DURATION,
+    COMMAND_ERRORS,
+    MetricsServer,
+    MongoCommandMetrics,
+    collect_bot_metrics,
+    registry,
+)
+from src.utils.prefixes import PrefixStore
+from src.utils.profiling import CommandProfile, CommandProfiler
+from src.utils.ratelimit import RateLimiter
+from src.utils.rest import RestCoordinator
+from src.utils.settings import GuildSettingsRepository
+from src.utils.stats import GuildStats
+from src.utils.system import SystemSampler
+from src.utils.tracing import command_transaction, finish_transaction, flush_sentry, setup_sentry
+from src.utils.tree import CommandTree
+from src.utils.watchdog import LoopWatchdog
 
 load_dotenv()
 
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
-DISCORD_PREFIX = os.getenv("DISCORD_PREFIX", ";")
+DISCORD_PREFIX = os.getenv("DISCORD_PREFIX") or ";"
 SENTRY_DSN = os.getenv("SENTRY_DSN")
+SENTRY_FAST_SAMPLE_RATE = float(os.getenv("SENTRY_FAST_SAMPLE_RATE", "0.05"))
+SENTRY_SLOW_THRESHOLD = float(os.getenv("SENTRY_SLOW_THRESHOLD", "1.0"))
 MONGODB_URL = os.getenv("MONGODB_URL")
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "50"))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "5"))
+MONGODB_TIMEOUT_MS = int(os.getenv("MONGODB_TIMEOUT_MS", "5000"))
 REDIS_URL = os.getenv("REDIS_URL")
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "32"))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "5"))
 
-BETTERSTACK_BOT_HEARTBEAT = os.getenv("BETTERSTACK_BOT_HEARTBEAT")
-BETTERSTACK_DB_HEARTBEAT = os.getenv("BETTERSTACK_DB_HEARTBEAT")
-BETTERSTACK_CACHE_HEARTBEAT = os.getenv("BETTERSTACK_CACHE_HEARTBEAT")
-
-sentry_sdk.init(
-    dsn=SENTRY_DSN,
-    traces_sample_rate=0.1,
-)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = os.getenv("METRICS_PORT")
 
-def console_info(message: str) -> None:
-    gradient_print(f"[INFO] {message}", start_color=Color.white, end_color=Color.blue)
+WATCHDOG_THRESHOLD = float(os.getenv("WATCHDOG_THRESHOLD", "0.5"))
 
-def console_warn(message: str) -> None:
-    gradient_print(f"[WARNING] {message}", start_color=Color.white, end_color=Color.yellow)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+CONSOLE_GRADIENT = os.getenv("CONSOLE_GRADIENT", "true").lower() in ("1", "true", "yes")
+MEMBER_CACHE_POLICY = os.getenv("MEMBER_CACHE_POLICY", "voice,joined")
+CHUNK_GUILDS_AT_STARTUP = os.getenv("CHUNK_GUILDS_AT_STARTUP", "false").lower() in ("1", "true", "yes")
+MESSAGE_CACHE_SIZE = int(os.getenv("MESSAGE_CACHE_SIZE", "1000"))
+INTERACTION_ACK_BUDGET = float(os.getenv("INTERACTION_ACK_BUDGET", "2.0"))
 
-def console_error(message: str) -> None:
-    gradient_print(f"[ERROR] {message}", start_color=Color.white, end_color=Color.red)
+BETTERSTACK_BOT_HEARTBEAT = os.getenv("BETTERSTACK_BOT_HEARTBEAT")
+BETTERSTACK_DB_HEARTBEAT = os.getenv("BETTERSTACK_DB_HEARTBEAT")
+BETTERSTACK_CACHE_HEARTBEAT = os.getenv("BETTERSTACK_CACHE_HEARTBEAT")
 
 class Bot(commands.AutoShardedBot):
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        cluster_id: int | None = None,
+        shard_ids: list[int] | None = None,
+        shard_count: int | None = None,
+    ) -> None:
         intents = discord.Intents.default()
         intents.message_content = True
         intents.members = True
 
+        self.rest = RestCoordinator(self)
+
         super().__init__(
-            command_prefix=DISCORD_PREFIX,
+            command_prefix=self._resolve_prefix,
             intents=intents,
             help_command=None,
             case_insensitive=True,
+            strip_after_prefix=True,
+            tree_cls=CommandTree,
+            member_cache_flags=member_cache_flags(MEMBER_CACHE_POLICY),
+            chunk_guilds_at_startup=CHUNK_GUILDS_AT_STARTUP,
+            max_messages=MESSAGE_CACHE_SIZE or None,
+            http_trace=self.rest.trace_config(),
+            shard_ids=shard_ids,
+            shard_count=shard_count,
             owner_ids={1424164764858449920},
             activity=discord.Activity(
                 type=discord.ActivityType.listening,
@@ -59,57 +102,133 @@ class Bot(commands.AutoShardedBot):
             status=discord.Status.online,
         )
 
+        self.tree.ack_budget = INTERACTION_ACK_BUDGET
+        self.cluster_id = cluster_id
+        self.member_cache_policy = MEMBER_CACHE_POLICY
         self.start_time: float = time.time()
         self.logger = logging.getLogger("drew.bot")
         self.db: motor.motor_asyncio.AsyncIOMotorClient | None = None
         self.http_session: aiohttp.ClientSession | None = None
+        self.cache: aioredis.Redis | None = None
+        self.system_stats = SystemSampler()
+        self.guild_stats = GuildStats()
+        self.help_catalog = HelpCatalog(self)
+        self.settings = GuildSettingsRepository(self)
+        self.ratelimits = RateLimiter(self)
+        self.prefixes = PrefixStore(self, DISCORD_PREFIX)
+        self.cluster_stats = ClusterStats(self)
+        self.health = HealthMonitor(self, self._heartbeats())
+        self.metrics_server: MetricsServer | None = None
+        self.profiler = CommandProfiler()
+        self.watchdog = LoopWatchdog(threshold=WATCHDOG_THRESHOLD)
+        self.cog_state: dict[str, dict] = {}
+        self.startup_phases: dict[str, float] = {}
+        self.cog_load_times: dict[str, float] = {}
+        self._mention_prefixes: tuple[str, ...] = ()
+
+    def _heartbeats(self) -> list[Heartbeat]:
+        heartbeats = []
+
+        if BETTERSTACK_BOT_HEARTBEAT:
+            heartbeats.append(Heartbeat("Bot", BETTERSTACK_BOT_HEARTBEAT, 180))
+
+        if BETTERSTACK_DB_HEARTBEAT:
+            heartbeats.append(Heartbeat("Database", BETTERSTACK_DB_HEARTBEAT, 300, requires="Database"))
+
+        if BETTERSTACK_CACHE_HEARTBEAT:
+            heartbeats.append(Heartbeat("Cache", BETTERSTACK_CACHE_HEARTBEAT, 60, requires="Cache"))
+
+        return heartbeats
+
+    async def _timed(self, phase: str, coro) -> None:
+        start = time.perf_counter()
+        try:
+            await coro
+        finally:
+            self.startup_phases[phase] = time.perf_counter() - start
+
+    async def start(self, token: str, *, reconnect: bool = True) -> None:
+        sentry_start = time.perf_counter()
+        setup_sentry(SENTRY_DSN, SENTRY_FAST_SAMPLE_RATE, SENTRY_SLOW_THRESHOLD)
+        self.startup_phases["sentry"] = time.perf_counter() - sentry_start
+
+        await super().start(token, reconnect=reconnect)
 
     async def setup_hook(self) -> None:
-        await self._setup_logging()
-        await self._setup_database()
-        await self._setup_cache()
-        await self._load_cogs()
+        started_at = time.perf_counter()
+        self._mention_prefixes = (
+            f"<@{self.user.id}> ",
+            f"<@!{self.user.id}> ",
+            f"<@{self.user.id}>",
+            f"<@!{self.user.id}>",
+        )
+
+        await self._timed("logging", self._setup_logging())
+        self.watchdog.start()
+
+        await asyncio.gather(
+            self._timed("database", self._setup_database()),
+            self._timed("cache", self._setup_cache()),
+        )
+        self.settings.start()
+
+        await self._timed("cogs", self._load_cogs())
+
+        self.system_stats.start()
+
+        if self.cluster_id is not None and self.cache is not None:
+            self.cluster_stats.start()
 
         self.http_session = aiohttp.ClientSession(
             timeout=aiohttp.ClientTimeout(total=10)
         )
 
-        if BETTERSTACK_BOT_HEARTBEAT:
-            self.bot_heartbeat_loop.start()
+        self.health.start()
 
-        if BETTERSTACK_DB_HEARTBEAT:
-            self.database_heartbeat_loop.start()
+        await self._timed("metrics", self._setup_metrics())
 
-        if BETTERSTACK_CACHE_HEARTBEAT:
-            self.cache_heartbeat_loop.start()
+        self.startup_phases["total"] = time.perf_counter() - started_at
 
-        console_info("Startup completed")
-        self.logger.info("Startup completed")
+        console_info(f"Startup completed in {self.startup_phases['total']:.2f}s")
+        self.logger.info("Startup completed\n%s", self.startup_report())
 
-    async def _setup_logging(self) -> None:
-        os.makedirs("src/logging", exist_ok=True)
-
-        self.logger.setLevel(logging.INFO)
+    def startup_report(self) -> str:
+        lines = [f"{phase:<10} {seconds * 1000:>9.1f}ms" for phase, seconds in self.startup_phases.items()]
+        lines.extend(
+            f"  cog {cog:<14} {seconds * 1000:>9.1f}ms"
+            for cog, seconds in sorted(self.cog_load_times.items(), key=lambda item: item[1], reverse=True)
+        )
+        return "\n".join(lines)
 
-        if not self.logger.handlers:
-            handler = RotatingFileHandler(
-                "src/logging/bot.log",
-                maxBytes=5 * 1024 * 1024,
-                backupCount=5,
-                encoding="utf-8",
-            )
-            handler.setFormatter(
-                logging.Formatter(
-                    "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
-                )
-            )
-            self.logger.addHandler(handler)
+    async def _setup_logging(self) -> None:
+        filename = "bot.log" if self.cluster_id is None else f"bot-{self.cluster_id}.log"
+        fields = {} if self.cluster_id is None else {"cluster": self.cluster_id}
+
+        setup_logging(
+            self.logger,
+            filename=filename,
+            json_output=LOG_FORMAT == "json",
+            gradient=CONSOLE_GRADIENT,
+            **fields,
+        )
 
         console_info("Logging initialized")
 
     async def _setup_database(self) -> None:
         try:
-            self.client = motor.motor_asyncio.AsyncIOMotorClient(MONGODB_URL)
+            self.client = motor.motor_asyncio.AsyncIOMotorClient(
+                MONGODB_URL,
+                appname="drew-bot",
+                maxPoolSize=MONGODB_MAX_POOL_SIZE,
+                minPoolSize=MONGODB_MIN_POOL_SIZE,
+                maxIdleTimeMS=60_000,
+                waitQueueTimeoutMS=MONGODB_TIMEOUT_MS,
+                serverSelectionTimeoutMS=MONGODB_TIMEOUT_MS,
+                connectTimeoutMS=MONGODB_TIMEOUT_MS,
+                retryReads=True,
+                retryWrites=True,
+                event_listeners=[MongoCommandMetrics()],
+            )
             self.db = self.client.get_database("db")
             console_info("Database initialized")
             self.logger.info("Database initialized")
@@ -119,133 +238,176 @@ class Bot(commands.AutoShardedBot):
 
     async def _setup_cache(self) -> None:
         try:
-            self.cache = redis.from_url(
-                url=REDIS_URL, 
+            pool = aioredis.BlockingConnectionPool.from_url(
+                url=REDIS_URL,
                 password=REDIS_PASSWORD,
-                decode_responses=True
+                decode_responses=True,
+                max_connections=REDIS_MAX_CONNECTIONS,
+                timeout=REDIS_POOL_TIMEOUT,
+                socket_timeout=REDIS_POOL_TIMEOUT,
+                socket_connect_timeout=REDIS_POOL_TIMEOUT,
+                socket_keepalive=True,
+                health_check_interval=30,
+                retry_on_timeout=True,
             )
+            self.cache = InstrumentedRedis.from_pool(pool)
             console_info("Cache initialized")
             self.logger.info("Cache initialized")
         except Exception:
             console_error("Cache initialization failed")
             self.logger.exception("Cache initialization failed")
 
+    async def _setup_metrics(self) -> None:
+        registry.add_collector(collect_bot_metrics(self))
+
+        if not METRICS_PORT:
+            return
+
+        port = int(METRICS_PORT) + (self.cluster_id or 0)
+        try:
+            self.metrics_server = MetricsServer(METRICS_HOST, port)
+            await self.metrics_server.start()
+            console_info(f"Metrics endpoint listening on {METRICS_HOST}:{port}")
+            self.logger.info("Metrics endpoint listening on %s:%s", METRICS_HOST, port)
+        except Exception:
+            self.metrics_server = None
+            console_error("Metrics endpoint initialization failed")
+            self.logger.exception("Metrics endpoint initialization failed")
+
+    async def _load_cog(self, cog: str) -> None:
+        start = time.perf_counter()
+        try:
+            await self.load_extension(f"src.cogs.{cog}")
+        except Exception:
+            console_error(f"Failed to load cog: {cog}")
+            self.logger.exception("Failed to load cog: %s", cog)
+            return
+        finally:
+            self.cog_load_times[cog] = time.perf_counter() - start
+
+        console_info(f"Cog loaded: {cog}")
+        self.logger.info("Cog loaded: %s", cog)
+
     async def _load_cogs(self) -> None:
         os.makedirs("src/cogs", exist_ok=True)
 
         for _, cog, _ in pkgutil.iter_modules(["src/cogs"]):
             if cog == "__pycache__":
                 continue
+            await self._load_cog(cog)
+
+    async def load_extension(self, name: str, *, package: str | None = None) -> None:
+        await super().load_extension(name, package=package)
+        self.help_catalog.invalidate()
+
+    async def unload_extension(self, name: str, *, package: str | None = None) -> None:
+        await super().unload_extension(name, package=package)
+        self.help_catalog.invalidate()
+
+    async def reload_extension(self, name: str, *, package: str | None = None) -> None:
+        name = self._resolve_name(name, package)
+        handoff = [
+            cog for cog in self.cogs.values()
+            if (cog.__module__ == name or cog.__module__.startswith(f"{name}."))
+            and hasattr(cog, "export_state")
+        ]
+        for cog in handoff:
+            self.cog_state[cog.qualified_name] = cog.export_state()
+
+        try:
+            await super().reload_extension(name)
+        finally:
+            for cog in handoff:
+                self.cog_state.pop(cog.qualified_name, None)
+            self.help_catalog.invalidate()
+
+    async def add_cog(self, cog: commands.Cog, /, **kwargs) -> None:
+        state = self.cog_state.get(cog.qualified_name)
+        if state is not None and hasattr(cog, "import_state"):
+            cog.import_state(state)
+        await super().add_cog(cog, **kwargs)
+
+    async def _resolve_prefix(self, bot: commands.Bot, message: discord.Message) -> list[str]:
+        guild_id = message.guild.id if message.guild else None
+        prefix = await self.prefixes.get(guild_id)
+        return [prefix, *self._mention_prefixes]
+
+    async def invoke(self, ctx: commands.Context) -> None:
+        name = ctx.command.qualified_name if ctx.command is not None else None
+        profile = CommandProfile()
+
+        with command_transaction("prefix", name) as transaction:
             try:
-                await self.load_extension(f"src.cogs.{cog}")
-                console_info(f"Cog loaded: {cog}")
-                self.logger.info("Cog loaded: %s", cog)
-            except Exception:
-                console_error(f"Failed to load cog: {cog}")
-                self.logger.exception("Failed to load cog: %s", cog)
+                await profile.run(super().invoke(ctx))
+            finally:
+                if name is not None:
+                    COMMAND_DURATION.observe(profile.wall, type="prefix", command=name)
+                    self.profiler.record("prefix", name, profile)
+                    if ctx.command_failed:
+                        COMMAND_ERRORS.inc(type="prefix", command=name)
+                finish_transaction(transaction, ctx.command_failed)
 
     async def on_message(self, message: discord.Message) -> None:
-        if message.author == self.user:
+        if message.author.bot or not message.content:
             return
-        
-        if self.user in message.mentions:
-            try:
-                command = message.content[len(message.mentions[0].mention):].strip()
-
-                if command:
-                    content = f"{os.getenv('DISCORD_PREFIX')}{command}"
-                    ctx = await self.get_context(message)
-                    ctx.message.content = content
-
-                    await self.invoke(ctx)  
-            except Exception:
-                pass
-        
-        await self.process_commands(message)
 
-    @tasks.loop(minutes=3)
-    async def bot_heartbeat_loop(self) -> None:
-        if not self.http_session:
-            return
+        content = message.content
+        guild_id = message.guild.id if message.guild else None
+        prefix = await self.prefixes.get(guild_id)
 
-        try:
-            async with self.http_session.get(BETTERSTACK_BOT_HEARTBEAT) as r:
-                if r.status != 200:
-                    console_warn(f"Bot heartbeat failed ({r.status})")
-        except Exception:
-            console_error("Bot heartbeat error")
-            self.logger.exception("Bot heartbeat error")
-
-    @bot_heartbeat_loop.before_loop
-    async def before_bot_heartbeat(self) -> None:
-        await self.wait_until_ready()
-        console_info("Bot heartbeat task started")
-        self.logger.info("Bot heartbeat task started")
-
-    @tasks.loop(minutes=5)
-    async def database_heartbeat_loop(self) -> None:
-        if not self.http_session or self.db is None:
+        if not content.startswith(prefix) and not content.startswith(self._mention_prefixes):
             return
 
-        try:
-            await self.db.command('ping')
+        await self.process_commands(message)
 
-            async with self.http_session.get(BETTERSTACK_DB_HEARTBEAT) as r:
-                if r.status != 200:
-                    console_warn(f"Database heartbeat failed ({r.status})")
-        except Exception:
-            console_error("Database heartbeat error")
-            self.logger.exception("Database heartbeat error")
+    async def close(self) -> None:
+        self.system_stats.stop()
+        self.health.stop()
+        self.watchdog.stop()
 
-    @database_heartbeat_loop.before_loop
-    async def before_database_heartbeat(self) -> None:
-        await self.wait_until_ready()
-        if self.db is not None:
-            console_info("Database heartbeat task started")
-            self.logger.info("Database heartbeat task started")
+        if self.metrics_server is not None:
+            await self.metrics_server.stop()
 
-    @tasks.loop(minutes=1)
-    async def cache_heartbeat_loop(self) -> None:
-        if not self.http_session or not self.cache:
-            return
+        if self.cluster_stats.publish_loop.is_running():
+            self.cluster_stats.stop()
+            try:
+                await self.cluster_stats.remove()
+            except Exception:
+                self.logger.exception("Failed to remove cluster stats")
 
         try:
-            self.cache.ping()
-            async with self.http_session.get(BETTERSTACK_CACHE_HEARTBEAT) as r:
-                if r.status != 200:
-                    console_warn(f"Cache heartbeat failed ({r.status})")
+            await self.settings.close()
         except Exception:
-            console_error("Cache heartbeat error")
-            self.logger.exception("Cache heartbeat error")
-
-    @cache_heartbeat_loop.before_loop
-    async def before_cache_heartbeat(self) -> None:
-        await self.wait_until_ready()
-        if self.cache:
-            console_info("Cache heartbeat task started")
-            self.logger.info("Cache heartbeat task started")
+            self.logger.exception("Failed to flush guild settings")
 
-
-    async def close(self) -> None:
         if self.http_session:
             await self.http_session.close()
 
         if self.db is not None:
             self.client.close()
 
-        if self.cache:
-            self.cache.close()
+        if self.cache is not None:
+            await self.cache.aclose()
     
-        if sentry_sdk.is_initialized():
-            sentry_sdk.flush(timeout=2)
+        await asyncio.to_thread(flush_sentry, 2)
 
         await super().close()
+        stop_logging()
 
-def main() -> None:
+def _raise_interrupt(*_) -> None:
+    raise KeyboardInterrupt
+
+def main(
+    cluster_id: int | None = None,
+    shard_ids: list[int] | None = None,
+    shard_count: int | None = None,
+) -> None:
     if not DISCORD_TOKEN:
         raise RuntimeError("DISCORD_TOKEN not set")
-    
-    Bot().run(DISCORD_TOKEN)
+
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+
+    Bot(cluster_id=cluster_id, shard_ids=shard_ids, shard_count=shard_count).run(DISCORD_TOKEN)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,177 @@
+import logging
+import math
+import multiprocessing
+import os
+import signal
+import time
+
+import requests
+from dotenv import load_dotenv
+
+from src.utils.logs import console_error, console_info, setup_logging, stop_logging
+
+load_dotenv()
+
+DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
+SHARD_COUNT = os.getenv("SHARD_COUNT")
+TOTAL_CLUSTERS = int(os.getenv("TOTAL_CLUSTERS") or os.cpu_count() or 1)
+CLUSTER_IDS = os.getenv("CLUSTER_IDS")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+CONSOLE_GRADIENT = os.getenv("CONSOLE_GRADIENT", "true").lower() in ("1", "true", "yes")
+
+IDENTIFY_INTERVAL_SECONDS = 5
+RESTART_BACKOFF_SECONDS = 5
+RESTART_BACKOFF_MAX_SECONDS = 300
+HEALTHY_RUNTIME_SECONDS = 600
+SUPERVISE_INTERVAL_SECONDS = 2
+
+logger = logging.getLogger("drew.cluster")
+
+def fetch_gateway() -> tuple[int, int]:
+    response = requests.get(
+        "https://discord.com/api/v10/gateway/bot",
+        headers={"Authorization": f"Bot {DISCORD_TOKEN}"},
+        timeout=10,
+    )
+    response.raise_for_status()
+    data = response.json()
+    return data["shards"], data["session_start_limit"]["max_concurrency"]
+
+def parse_cluster_ids(value: str | None, total: int) -> list[int]:
+    if not value:
+        return list(range(total))
+
+    ids = []
+    for part in value.split(","):
+        start, _, end = part.strip().partition("-")
+        ids.extend(range(int(start), int(end or start) + 1))
+    return sorted({i for i in ids if 0 <= i < total})
+
+def shard_ranges(shard_count: int, clusters: int) -> list[list[int]]:
+    per_cluster = math.ceil(shard_count / clusters)
+    return [
+        list(range(i, min(i + per_cluster, shard_count)))
+        for i in range(0, shard_count, per_cluster)
+    ]
+
+def run_cluster(cluster_id: int, shard_ids: list[int], shard_count: int) -> None:
+    from src.bot import main
+
+    main(cluster_id=cluster_id, shard_ids=shard_ids, shard_count=shard_count)
+
+class Cluster:
+    def __init__(self, cluster_id: int, shard_ids: list[int], shard_count: int) -> None:
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self.process: multiprocessing.Process | None = None
+        self.started_at = 0.0
+        self.backoff = RESTART_BACKOFF_SECONDS
+        self.restart_at = 0.0
+
+    def start(self, context) -> None:
+        self.process = context.Process(
+            target=run_cluster,
+            args=(self.cluster_id, self.shard_ids, self.shard_count),
+            name=f"drew-cluster-{self.cluster_id}",
+        )
+        self.process.start()
+        self.started_at = time.monotonic()
+        console_info(f"Cluster {self.cluster_id} started (shards {self.shard_ids[0]}-{self.shard_ids[-1]}, pid {self.process.pid})")
+        logger.info("Cluster %s started (shards %s-%s, pid %s)", self.cluster_id, self.shard_ids[0], self.shard_ids[-1], self.process.pid)
+
+    def stop(self, timeout: float = 30) -> None:
+        if self.process is None or not self.process.is_alive():
+            return
+
+        self.process.terminate()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+
+class Launcher:
+    """Runs one bot process per cluster, each owning a contiguous shard range, and restarts them when they exit."""
+
+    def __init__(self) -> None:
+        self.context = multiprocessing.get_context("spawn")
+        self.clusters: list[Cluster] = []
+        self.running = True
+
+    def _plan(self) -> tuple[list[Cluster], int]:
+        if SHARD_COUNT:
+            shard_count, max_concurrency = int(SHARD_COUNT), 1
+        else:
+            shard_count, max_concurrency = fetch_gateway()
+
+        ranges = shard_ranges(shard_count, min(TOTAL_CLUSTERS, shard_count))
+        clusters = [
+            Cluster(cluster_id, ranges[cluster_id], shard_count)
+            for cluster_id in parse_cluster_ids(CLUSTER_IDS, len(ranges))
+        ]
+        return clusters, max_concurrency
+
+    def _stop(self, *_) -> None:
+        self.running = False
+
+    def run(self) -> None:
+        if not DISCORD_TOKEN:
+            raise RuntimeError("DISCORD_TOKEN not set")
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        self.clusters, max_concurrency = self._plan()
+        console_info(f"Launching {len(self.clusters)} cluster(s)")
+        logger.info("Launching %s cluster(s)", len(self.clusters))
+
+        for cluster in self.clusters:
+            if not self.running:
+                break
+            cluster.start(self.context)
+            time.sleep(IDENTIFY_INTERVAL_SECONDS * math.ceil(len(cluster.shard_ids) / max_concurrency))
+
+        try:
+            self.supervise()
+        finally:
+            for cluster in self.clusters:
+                cluster.stop()
+            console_info("All clusters stopped")
+            logger.info("All clusters stopped")
+
+    def supervise(self) -> None:
+        while self.running:
+            now = time.monotonic()
+
+            for cluster in self.clusters:
+                if cluster.process is None or cluster.process.is_alive():
+                    continue
+
+                if cluster.restart_at == 0.0:
+                    if now - cluster.started_at >= HEALTHY_RUNTIME_SECONDS:
+                        cluster.backoff = RESTART_BACKOFF_SECONDS
+                    cluster.restart_at = now + cluster.backoff
+                    console_error(f"Cluster {cluster.cluster_id} exited ({cluster.process.exitcode}), restarting in {cluster.backoff}s")
+                    logger.error(
+                        "Cluster %s exited (%s), restarting in %ss", cluster.cluster_id, cluster.process.exitcode, cluster.backoff
+                    )
+                    cluster.backoff = min(cluster.backoff * 2, RESTART_BACKOFF_MAX_SECONDS)
+                elif now >= cluster.restart_at:
+                    cluster.restart_at = 0.0
+                    cluster.start(self.context)
+
+            time.sleep(SUPERVISE_INTERVAL_SECONDS)
+
+def main() -> None:
+    setup_logging(
+        logger,
+        filename="cluster.log",
+        json_output=LOG_FORMAT == "json",
+        gradient=CONSOLE_GRADIENT,
+    )
+    try:
+        Launcher().run()
+    finally:
+        stop_logging()
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,38 @@
 import os
-import sentry_sdk
 import discord
 from discord import app_commands
 from discord.ext import commands
-from rgbprint import gradient_print, Color
+from src.utils.ttl import TTLCache
+from src.utils.logs import console_info
+from src.utils.tracing import report_exception
 
 ANTI_DEBOUNCE_SECONDS = 15
+LOCAL_NOTICE_CACHE_SIZE = 10_000
 
 class Events(commands.Cog):
     def __init__(self, bot) -> None:
         self.bot = bot
+        self.notices = TTLCache(maxsize=LOCAL_NOTICE_CACHE_SIZE, ttl=ANTI_DEBOUNCE_SECONDS)
+
+    def export_state(self) -> dict:
+        return {"notices": self.notices}
+
+    def import_state(self, state: dict) -> None:
+        self.notices = state["notices"]
 
     async def cooldown_message(self, user_id, command_name) -> bool:
         key = f"cooldown:{user_id}:{command_name}"
-        exists = self.bot.cache.get(key)
-        if exists:
+        if self.notices.get(key) is not None:
             return False
-        self.bot.cache.set(key, "1", ex=ANTI_DEBOUNCE_SECONDS)
-        return True
+
+        async with self.bot.cache.pipeline(transaction=False) as pipe:
+            pipe.set(key, "1", ex=ANTI_DEBOUNCE_SECONDS, nx=True)
+            pipe.pttl(key)
+            created, remaining = await pipe.execute()
+
+        if remaining > 0:
+            self.notices.set(key, True, ttl=remaining / 1000)
+        return bool(created)
 
     @commands.Cog.listener()
     async def on_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError) -> None:
@@ -35,11 +50,11 @@ class Events(commands.Cog):
                 description=f'{error}',
                 color=0xFFFFFF
             )
-            await interaction.author.send(embed=embed)
-            sentry_sdk.capture_exception(error)
+            await interaction.user.send(embed=embed)
+            report_exception(error)
             raise error
         else:
-            sentry_sdk.capture_exception(error)
+            report_exception(error)
             raise error
 
     @commands.Cog.listener()
@@ -48,7 +63,7 @@ class Events(commands.Cog):
             if isinstance(error, commands.CommandNotFound):
                 embed = discord.Embed(
                     title="Search",
-                    description=f"The command `{ctx.invoked_with}` was not found. Use `{self.bot.command_prefix}help` to see all commands",
+                    description=f"The command `{ctx.invoked_with}` was not found. Use `{ctx.clean_prefix}help` to see all commands",
                     color=0xFFFFFF
                 )
                 await ctx.send(embed=embed, delete_after=30)
@@ -81,6 +96,13 @@ class Events(commands.Cog):
                     color=0xFFFFFF
                 )
                 await ctx.send(embed=embed, delete_after=30)
+            elif isinstance(error, commands.MissingPermissions):
+                embed = discord.Embed(
+                    title="Permissions",
+                    description=f"You don't have the permission(s) `{error.missing_permissions}` to use this command.",
+                    color=0xFFFFFF
+                )
+                await ctx.send(embed=embed, delete_after=30)
             elif isinstance(error, commands.BotMissingPermissions):
                 embed = discord.Embed(
                     title="Permissions",
@@ -102,18 +124,45 @@ class Events(commands.Cog):
                     color=0xFFFFFF
                 )
                 await ctx.send(embed=embed)
-                sentry_sdk.capture_exception(error)
+                report_exception(error)
                 raise error
             else:
-                sentry_sdk.capture_exception(error)
+                report_exception(error)
                 raise error
         except Exception as e:
-            sentry_sdk.capture_exception(e)
+            report_exception(e)
             raise e
 
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        self.bot.guild_stats.add_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        self.bot.guild_stats.remove_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member) -> None:
+        self.bot.guild_stats.add_member(member.guild)
+
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent) -> None:
+        guild = self.bot.get_guild(payload.guild_id)
+        if guild is not None:
+            self.bot.guild_stats.remove_member(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel) -> None:
+        self.bot.guild_stats.add_channel(channel.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        self.bot.guild_stats.remove_channel(channel.guild)
+
     @commands.Cog.listener()
     async def on_ready(self) -> None:
-        gradient_print(f"Connected to gateway as {self.bot.user.name}#{self.bot.user.discriminator} ({self.bot.user.id})", start_color=Color.white, end_color=Color.blue)
+        self.bot.guild_stats.rebuild(self.bot.guilds)
+        console_info(f"Connected to gateway as {self.bot.user.name}#{self.bot.user.discriminator} ({self.bot.user.id})")
 
 async def setup(bot):
     await bot.add_cog(Events(bot))
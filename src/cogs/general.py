@@ -1,9 +1,15 @@
-import psutil
+import contextlib
 import time
-import aiohttp
 import discord
 from discord import app_commands
 from discord.ext import commands
+from src.utils.help import HelpPaginator
+from src.utils.prefixes import MAX_PREFIX_LENGTH
+from src.utils.ratelimit import app_cooldown, cooldown
+
+PING_FIELDS = ("RTT", "WebSocket", "REST", "API", "Database", "Cache")
+PING_EDIT_INTERVAL = 0.75
+ABOUT_AVERAGE_WINDOW = 60
 
 def format_uptime(seconds: int) -> str:
     days, seconds = divmod(seconds, 86400)
@@ -12,73 +18,95 @@ def format_uptime(seconds: int) -> str:
 
     return f"{days}d {hours}h {minutes}m {seconds}s"
 
-class General(commands.Cog):
-    def __init__(self, bot: commands.Bot):
-        self.bot = bot
+def format_latency(latency) -> str:
+    if latency is None:
+        return "…"
+    if isinstance(latency, int):
+        return f"{latency}ms"
+    return latency
 
-    @app_commands.command(name="help", description="Displays a list of available slash commands")
-    @app_commands.checks.cooldown(1, 15, key=lambda i: i.user.id)
-    async def help(self, interaction: discord.Interaction):
-        embed = discord.Embed(
-            title="Commands",
-            description="Here's a list of all available commands:",
-            color=0xFFFFFF
-        )
-        
-        for command in self.bot.tree.get_commands():
-            if command.description:
-                embed.add_field(
-                    name=f"/{command.name}",
-                    value=command.description,
-                    inline=False
-                )
-        embed.set_footer(
-            text="Use each command as shown, or type help [command] for more details."
-        )
-        
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+def build_ping_embed(latencies: dict) -> discord.Embed:
+    embed = discord.Embed(
+        title="Ping",
+        color=0xFFFFFF
+    )
 
-    @commands.command(name="help", description="Displays a list of available prefix commands")
-    @commands.cooldown(1, 15, commands.BucketType.user)
-    async def help_cmd(self, ctx: commands.Context):
-        embed = discord.Embed(
-            title="Commands",
-            description="Here's a list of all available prefix commands:",
-            color=0xFFFFFF
+    for name in PING_FIELDS:
+        embed.add_field(
+            name=name,
+            value=format_latency(latencies.get(name)),
+            inline=True
         )
 
-        for command in self.bot.commands:
-            if not command.hidden:
-                description = command.description
-                embed.add_field(
-                    name=f"{ctx.prefix}{command.name}",
-                    value=description,
-                    inline=False
-                )
+    return embed
 
-        embed.set_footer(
-            text="Use each command as shown, or type help [command] for more details."
+class General(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.probes = bot.health.engine
+
+    def _command_not_found(self, name: str, prefix: str) -> discord.Embed:
+        return discord.Embed(
+            title="Search",
+            description=f"The command `{name}` was not found. Use `{prefix}help` to see all commands",
+            color=0xFFFFFF
         )
 
-        await ctx.send(embed=embed)
+    @app_commands.command(name="help", description="Displays a list of available slash commands")
+    @app_commands.describe(command="Command to show details for")
+    @app_cooldown(1, 15, key=lambda i: i.user.id)
+    async def help(self, interaction: discord.Interaction, command: str | None = None):
+        catalog = self.bot.help_catalog
+
+        if command:
+            embed = catalog.detail("slash", command) or self._command_not_found(command, "/")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        pages = catalog.pages("slash")
+        if len(pages) > 1:
+            view = HelpPaginator(pages, interaction.user.id)
+            await interaction.response.send_message(embed=pages[0], view=view, ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=pages[0], ephemeral=True)
 
-    @app_commands.command(name="about", description="Shows bot and system statistics")
-    @app_commands.checks.cooldown(1, 15, key=lambda i: i.user.id)
-    async def about(self, interaction: discord.Interaction): 
-        ram_total = round(psutil.virtual_memory().total / (1024 ** 3))
-        ram_usage = round(psutil.virtual_memory().used / (1024 ** 3))
-        cpu_percent = round(psutil.cpu_percent(interval=0.1))
-        disk_total = round(psutil.disk_usage('/').total / (1024 ** 3))
-        disk_usage = round(psutil.disk_usage('/').used / (1024 ** 3))
-
-        total_guilds = len(self.bot.guilds)
-        total_users = sum(guild.member_count for guild in self.bot.guilds)
-        total_channels = sum(len(guild.channels) for guild in self.bot.guilds)
+    @commands.command(name="help", description="Displays a list of available prefix commands")
+    @cooldown(1, 15, commands.BucketType.user)
+    async def help_cmd(self, ctx: commands.Context, *, command: str | None = None):
+        catalog = self.bot.help_catalog
+
+        if command:
+            embed = catalog.detail("prefix", command, ctx.clean_prefix) or self._command_not_found(command, ctx.clean_prefix)
+            await ctx.send(embed=embed)
+            return
+
+        pages = catalog.pages("prefix", ctx.clean_prefix)
+        if len(pages) > 1:
+            await ctx.send(embed=pages[0], view=HelpPaginator(pages, ctx.author.id))
+        else:
+            await ctx.send(embed=pages[0])
+
+    async def _build_about_embed(self, shard_id: int | None) -> discord.Embed:
+        sampler = self.bot.system_stats
+        snapshot = sampler.latest or await sampler.sample()
+        average = sampler.average(ABOUT_AVERAGE_WINDOW) or snapshot
+
+        ram_total = round(snapshot.ram_total / (1024 ** 3))
+        ram_usage = round(snapshot.ram_used / (1024 ** 3))
+        cpu_percent = round(snapshot.cpu_percent)
+        cpu_average = round(average.cpu_percent)
+        disk_total = round(snapshot.disk_total / (1024 ** 3))
+        disk_usage = round(snapshot.disk_used / (1024 ** 3))
+
+        totals = await self.bot.cluster_stats.totals()
+        total_guilds = totals.guilds
+        total_users = totals.users
+        total_channels = totals.channels
         total_commands = len(self.bot.commands)
 
         bot_ping = round(self.bot.latency * 1000)
-        
-        shard_id = interaction.guild.shard_id
+        average_ping = round(totals.latency * 1000)
+
         total_shards = self.bot.shard_count
 
         uptime = format_uptime(int(time.time() - self.bot.start_time))
@@ -95,7 +123,7 @@ class General(commands.Cog):
         )
         embed.add_field(
             name='CPU',
-            value=f'usage: {cpu_percent}%',
+            value=f'usage: {cpu_percent}%\navg 1m: {cpu_average}%',
             inline=True
         )
         embed.add_field(
@@ -125,7 +153,7 @@ class General(commands.Cog):
         )
         embed.add_field(
             name="Ping",
-            value=f'{bot_ping}ms',
+            value=f'{bot_ping}ms' if totals.clusters == 1 else f'{bot_ping}ms\navg: {average_ping}ms',
             inline=True
         )
         embed.add_field(
@@ -133,183 +161,89 @@ class General(commands.Cog):
             value=f"{shard_id}/{total_shards}",
             inline=True
         )
+
+        footer = f"uptime: {uptime}"
+        if self.bot.cluster_id is not None:
+            footer = f"{footer} • cluster {self.bot.cluster_id} of {totals.clusters}"
         embed.set_footer(
-            text=f"uptime: {uptime}"
+            text=footer
         )
 
+        return embed
+
+    @app_commands.command(name="about", description="Shows bot and system statistics")
+    @app_cooldown(1, 15, key=lambda i: i.user.id)
+    async def about(self, interaction: discord.Interaction):
+        embed = await self._build_about_embed(interaction.guild.shard_id)
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
     @commands.command(name="about", aliases=["stats", "stat"], description="Shows bot and system statistics")
-    @commands.cooldown(1, 15, commands.BucketType.user)       
+    @cooldown(1, 15, commands.BucketType.user)
     async def about_cmd(self, ctx):
-        ram_total = round(psutil.virtual_memory().total / (1024 ** 3))
-        ram_usage = round(psutil.virtual_memory().used / (1024 ** 3))
-        cpu_percent = round(psutil.cpu_percent(interval=0.1))
-        disk_total = round(psutil.disk_usage('/').total / (1024 ** 3))
-        disk_usage = round(psutil.disk_usage('/').used / (1024 ** 3))
-
-        total_guilds = len(self.bot.guilds)
-        total_users = sum(guild.member_count for guild in self.bot.guilds)
-        total_channels = sum(len(guild.channels) for guild in self.bot.guilds)
-        total_commands = len(self.bot.commands)
-
-        bot_ping = round(self.bot.latency * 1000)
-        
-        shard_id = ctx.guild.shard_id
-        total_shards = self.bot.shard_count
-
-        uptime = format_uptime(int(time.time() - self.bot.start_time))
-
-        embed = discord.Embed(
-            title="About",
-            color=0xFFFFFF
-        )
-
-        embed.add_field(
-            name='RAM',
-            value=f'total: {ram_total} GB\nusage: {ram_usage} GB',
-            inline=True
-        )
-        embed.add_field(
-            name='CPU',
-            value=f'usage: {cpu_percent}%',
-            inline=True
-        )
-        embed.add_field(
-            name='Disk',
-            value=f'total: {disk_total} GB\nusage: {disk_usage} GB',
-            inline=True
-        )
-        embed.add_field(
-            name="Guilds",
-            value=total_guilds,
-            inline=True
-        )
-        embed.add_field(
-            name="Channels",
-            value=total_channels,
-            inline=True
-        )
-        embed.add_field(
-            name="Users",
-            value=total_users,
-            inline=True
-        )
-        embed.add_field(
-            name="Commands",
-            value=total_commands,
-            inline=True
-        )
-        embed.add_field(
-            name="Ping",
-            value=f'{bot_ping}ms',
-            inline=True
-        )
-        embed.add_field(
-            name="Shard",
-            value=f"{shard_id}/{total_shards}",
-            inline=True
-        )
-        embed.set_footer(
-            text=f"uptime: {uptime}"
-        )
-
+        embed = await self._build_about_embed(ctx.guild.shard_id)
         await ctx.send(embed=embed)
 
-    @app_commands.command(name="ping", description="Check the bot's latency")
-    @app_commands.checks.cooldown(1, 15, key=lambda i: i.user.id)
-    async def ping(self, interaction: discord.Interaction):
-        start = time.perf_counter()
+    async def _render_ping(self, edit, rtt_latency: int, tasks: list | None, cached: tuple | None) -> None:
+        latencies = {
+            "RTT": rtt_latency,
+            "WebSocket": round(self.bot.latency * 1000),
+        }
 
-        await interaction.response.send_message(
-            embed=discord.Embed(
-                description="Pinging…",
-                color=0xFFFFFF
-            ),
-            ephemeral=True
-        )
+        if cached is not None:
+            results, age = cached
+            latencies.update(results)
+            embed = build_ping_embed(latencies)
+            embed.set_footer(text=f"backends checked {round(age)}s ago")
+            await edit(embed=embed)
+            return
 
-        rtt_latency = round((time.perf_counter() - start) * 1000)
+        last_edit = time.perf_counter()
 
-        websocket_latency = round(self.bot.latency * 1000)
+        async with contextlib.aclosing(self.probes.stream(tasks)) as stream:
+            async for name, latency in stream:
+                latencies[name] = latency
+                if time.perf_counter() - last_edit >= PING_EDIT_INTERVAL:
+                    await edit(embed=build_ping_embed(latencies))
+                    last_edit = time.perf_counter()
 
-        try:
-            start = time.perf_counter()
-            async with self.bot.http_session.get(
-                "https://discord.com/api/v10/users/@me",
-                headers={"Authorization": f"Bot {self.bot.http.token}"}
-            ):
-                pass
-            rest_latency = round((time.perf_counter() - start) * 1000)
-        except Exception:
-            rest_latency = "Error"
+        await edit(embed=build_ping_embed(latencies))
 
-        try:
-            start = time.perf_counter()
-            async with self.bot.http_session.get(
-                "https://api.neevets.website",
-                timeout=aiohttp.ClientTimeout(total=5)
-            ):
-                pass
-            api_latency = round((time.perf_counter() - start) * 1000)
-        except Exception:
-            api_latency = "Error"
+    def _start_ping(self, live: bool) -> tuple[list | None, tuple | None]:
+        cached = None if live else self.bot.health.cached()
+        tasks = None if cached is not None else self.probes.start()
+        return tasks, cached
 
-        try:
-            start = time.perf_counter()
-            await self.bot.db.command('ping')
-            db_latency = round((time.perf_counter() - start) * 1000)
-        except Exception:
-            db_latency = "Error"
+    def _cancel_ping(self, tasks: list | None) -> None:
+        for task in tasks or ():
+            task.cancel()
 
-        try:
-            start = time.perf_counter()
-            self.bot.cache.ping()
-            cache_latency = round((time.perf_counter() - start) * 1000)
-        except Exception:
-            cache_latency = "Error"
+    @app_commands.command(name="ping", description="Check the bot's latency")
+    @app_commands.describe(live="Probe every backend now instead of using the latest health check")
+    @app_cooldown(1, 15, key=lambda i: i.user.id)
+    async def ping(self, interaction: discord.Interaction, live: bool = False):
+        tasks, cached = self._start_ping(live)
+        start = time.perf_counter()
 
-        embed = discord.Embed(
-            title="Ping",
-            color=0xFFFFFF
-        )
+        try:
+            await interaction.response.send_message(
+                embed=discord.Embed(
+                    description="Pinging…",
+                    color=0xFFFFFF
+                ),
+                ephemeral=True
+            )
+        except BaseException:
+            self._cancel_ping(tasks)
+            raise
 
-        embed.add_field(
-            name="RTT",
-            value=f"{rtt_latency}ms",
-            inline=True
-        )
-        embed.add_field(
-            name="WebSocket",
-            value=f"{websocket_latency}ms",
-            inline=True
-        )
-        embed.add_field(
-            name="REST",
-            value=f"{rest_latency}ms",
-            inline=True
-        )
-        embed.add_field(
-            name="API",
-            value=f"{api_latency}ms",
-            inline=True
-        )
-        embed.add_field(
-            name="Database",
-            value=f"{db_latency}ms",
-            inline=True
-        )
-        embed.add_field(
-            name="Cache",
-            value=f"{cache_latency}ms",
-            inline=True
-        )
+        rtt_latency = round((time.perf_counter() - start) * 1000)
 
-        await interaction.edit_original_response(embed=embed)
+        await self._render_ping(interaction.edit_original_response, rtt_latency, tasks, cached)
 
     @commands.command(name="ping", aliases=["latency", "rtt"], description="Check the bot's latency")
-    @commands.cooldown(1, 15, commands.BucketType.user)
-    async def ping_cmd(self, ctx: commands.Context):
+    @cooldown(1, 15, commands.BucketType.user)
+    async def ping_cmd(self, ctx: commands.Context, live: bool = False):
+        tasks, cached = self._start_ping(live)
         start = time.perf_counter()
 
         embed = discord.Embed(
@@ -317,88 +251,63 @@ class General(commands.Cog):
             color=0xFFFFFF
         )
 
-        message = await ctx.send(embed=embed)
+        try:
+            message = await ctx.send(embed=embed)
+        except BaseException:
+            self._cancel_ping(tasks)
+            raise
 
         rtt_latency = round((time.perf_counter() - start) * 1000)
 
-        websocket_latency = round(self.bot.latency * 1000)
+        await self._render_ping(message.edit, rtt_latency, tasks, cached)
 
-        try:
-            start = time.perf_counter()
-            async with self.bot.http_session.get(
-                "https://discord.com/api/v10/users/@me",
-                headers={"Authorization": f"Bot {self.bot.http.token}"}
-            ):
-                pass
-            rest_latency = round((time.perf_counter() - start) * 1000)
-        except Exception:
-            rest_latency = "Error"
-
-        try:
-            start = time.perf_counter()
-            async with self.bot.http_session.get(
-                "https://api.neevets.website",
-                timeout=aiohttp.ClientTimeout(total=5)
-            ):
-                pass
-            api_latency = round((time.perf_counter() - start) * 1000)
-        except Exception:
-            api_latency = "Error"
+    async def _update_prefix(self, guild: discord.Guild, prefix: str | None) -> discord.Embed:
+        store = self.bot.prefixes
 
-        try:
-            start = time.perf_counter()
-            await self.bot.db.command('ping')
-            db_latency = round((time.perf_counter() - start) * 1000)
-        except Exception:
-            db_latency = "Error"
+        if prefix is None:
+            current = await store.get(guild.id)
+            return discord.Embed(
+                title="Prefix",
+                description=f"The prefix for this server is `{current}`.",
+                color=0xFFFFFF
+            )
 
-        try:
-            start = time.perf_counter()
-            self.bot.cache.ping()
-            cache_latency = round((time.perf_counter() - start) * 1000)
-        except Exception:
-            cache_latency = "Error"
+        prefix = prefix.strip()
+        if not prefix or len(prefix) > MAX_PREFIX_LENGTH:
+            return discord.Embed(
+                title="Prefix",
+                description=f"The prefix must be between `1` and `{MAX_PREFIX_LENGTH}` characters.",
+                color=0xFFFFFF
+            )
 
-        embed = discord.Embed(
-            title="Ping",
+        await store.set(guild.id, prefix)
+        return discord.Embed(
+            title="Prefix",
+            description=f"The prefix for this server is now `{prefix}`.",
             color=0xFFFFFF
         )
 
-        embed.add_field(
-            name="RTT",
-            value=f"{rtt_latency}ms",
-            inline=True
-        )
-        embed.add_field(
-            name="WebSocket",
-            value=f"{websocket_latency}ms",
-            inline=True
-        )
-        embed.add_field(
-            name="REST",
-            value=f"{rest_latency}ms",
-            inline=True
-        )
-        embed.add_field(
-            name="API",
-            value=f"{api_latency}ms",
-            inline=True
-        )
-        embed.add_field(
-            name="Database",
-            value=f"{db_latency}ms",
-            inline=True
-        )
-        embed.add_field(
-            name="Cache",
-            value=f"{cache_latency}ms",
-            inline=True
-        )
+    @app_commands.command(name="prefix", description="Shows or changes the server prefix")
+    @app_commands.describe(prefix="New prefix for prefix commands")
+    @app_commands.guild_only()
+    @app_commands.default_permissions(manage_guild=True)
+    @app_cooldown(1, 15, key=lambda i: i.guild_id)
+    async def prefix(self, interaction: discord.Interaction, prefix: str | None = None):
+        embed = await self._update_prefix(interaction.guild, prefix)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
-        await message.edit(content=None, embed=embed)
+    @commands.command(name="prefix", description="Shows or changes the server prefix")
+    @commands.guild_only()
+    @cooldown(1, 15, commands.BucketType.guild)
+    async def prefix_cmd(self, ctx: commands.Context, prefix: str | None = None):
+        if prefix is not None and not ctx.author.guild_permissions.manage_guild:
+            raise commands.MissingPermissions(["manage_guild"])
+
+        embed = await self._update_prefix(ctx.guild, prefix)
+        await ctx.send(embed=embed)
 
     @app_commands.command(name="invite", description="Get the bot link")
-    @app_commands.checks.cooldown(1, 15, key=lambda i: i.user.id)
+    @app_cooldown(1, 15, key=lambda i: i.user.id)
     async def invite(self, interaction: discord.Interaction):
         bot_invitation = f'https://discord.com/oauth2/authorize?client_id={self.bot.user.id}&permissions=8&integration_type=0&scope=bot+applications.commands'
         
@@ -416,7 +325,7 @@ class General(commands.Cog):
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
     @commands.command(name='invite', description="Get the bot link", aliases=['inv'])
-    @commands.cooldown(1, 15, commands.BucketType.user)
+    @cooldown(1, 15, commands.BucketType.user)
     async def invite_cmd(self, ctx):
         bot_invitation = f'https://discord.com/oauth2/authorize?client_id={self.bot.user.id}&permissions=8&integration_type=0&scope=bot+applications.commands'
         
@@ -1,10 +1,275 @@
+import asyncio
+import datetime
+import re
+from typing import Literal
 import discord
+from discord import app_commands
 from discord.ext import commands
+from src.utils.memory import ensure_chunked
+from src.utils.moderation import ModerationJob, ProgressView, bulk_ban, bulk_member_action, purge_messages, report_progress
+from src.utils.ratelimit import app_cooldown, cooldown
+
+PURGE_MAX_MESSAGES = 10_000
+MASS_ACTION_PERMISSIONS = {
+    "ban": "ban_members",
+    "kick": "kick_members",
+    "timeout": "moderate_members",
+}
+USER_ID = re.compile(r"\d{15,20}")
+MEMBER_QUERY_LIMIT = 100
 
 class Moderation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.jobs: dict[int, ModerationJob] = {}
+        self._reporters: set[asyncio.Task] = set()
+
+    def export_state(self) -> dict:
+        return {"jobs": self.jobs}
+
+    def import_state(self, state: dict) -> None:
+        self.jobs = state["jobs"]
+
+    def _busy(self, guild_id: int) -> discord.Embed | None:
+        job = self.jobs.get(guild_id)
+        if job is None or job.finished:
+            return None
+        return discord.Embed(
+            title="Moderation",
+            description="A moderation job is already running in this server, cancel it first.",
+            color=0xFFFFFF
+        )
+
+    def _start(self, guild_id: int, job: ModerationJob, coro) -> None:
+        job.task = asyncio.create_task(coro)
+        self.jobs[guild_id] = job
+
+        def finished(task: asyncio.Task) -> None:
+            if self.jobs.get(guild_id) is job:
+                del self.jobs[guild_id]
+            if not task.cancelled() and task.exception() is not None:
+                job.error = str(task.exception())
+                self.bot.logger.error("Moderation job %s failed", job.kind, exc_info=task.exception())
+
+        job.task.add_done_callback(finished)
+
+    def _report(self, job: ModerationJob, edit) -> None:
+        task = asyncio.create_task(report_progress(job, edit))
+        self._reporters.add(task)
+        task.add_done_callback(self._reporters.discard)
+
+    def _purge_job(self, channel, amount: int, author_id: int, user, contains: str | None, bots: bool, before=None) -> ModerationJob:
+        contains = contains.casefold() if contains else None
+
+        def check(message: discord.Message) -> bool:
+            if message.pinned:
+                return False
+            if user is not None and message.author.id != user.id:
+                return False
+            if bots and not message.author.bot:
+                return False
+            return contains is None or contains in message.content.casefold()
+
+        job = ModerationJob("purge", max(1, min(amount, PURGE_MAX_MESSAGES)), author_id)
+        self._start(channel.guild.id, job, purge_messages(job, channel, check, before=before))
+        return job
+
+    async def _resolve_targets(
+        self, guild: discord.Guild, author: discord.Member, users: str | None, joined_within: int | None
+    ) -> tuple[list[int], int]:
+        """Collect target IDs and drop members the author or the bot cannot act on, returning how many were skipped."""
+        targets = {int(user_id) for user_id in USER_ID.findall(users or "")}
+
+        if joined_within:
+            await ensure_chunked(guild)
+            since = discord.utils.utcnow() - datetime.timedelta(minutes=joined_within)
+            targets.update(member.id for member in guild.members if member.joined_at and member.joined_at >= since)
+
+        targets.difference_update({self.bot.user.id, author.id, guild.owner_id})
+
+        members = [member for member in map(guild.get_member, targets) if member is not None]
+        missing = sorted(targets.difference(member.id for member in members))
+        for start in range(0, len(missing), MEMBER_QUERY_LIMIT):
+            members.extend(await guild.query_members(user_ids=missing[start:start + MEMBER_QUERY_LIMIT], cache=True))
+
+        above = {
+            member.id
+            for member in members
+            if member.top_role >= guild.me.top_role or (author.id != guild.owner_id and member.top_role >= author.top_role)
+        }
+
+        targets.difference_update(above)
+        return sorted(targets), len(above)
+
+    def _unavailable(self, guild_id: int, targets: list[int], skipped: int) -> discord.Embed | None:
+        """Checked again after resolving targets, which awaits, so no other job can start in between."""
+        busy = self._busy(guild_id)
+        if busy is not None or targets:
+            return busy
+
+        description = "There are no members to act on."
+        if skipped:
+            description += f" {skipped} were skipped because of the role hierarchy."
+        return discord.Embed(
+            title="Moderation",
+            description=description,
+            color=0xFFFFFF
+        )
+
+    def _mass_job(
+        self, guild: discord.Guild, action: str, targets: list[int], skipped: int, author_id: int, reason: str, duration: int
+    ) -> ModerationJob:
+        job = ModerationJob(action, len(targets), author_id)
+        job.skipped = skipped
+
+        if action == "ban":
+            coro = bulk_ban(job, guild, targets, reason)
+        elif action == "kick":
+            coro = bulk_member_action(job, targets, lambda user_id: guild.kick(discord.Object(id=user_id), reason=reason))
+        else:
+            until = (discord.utils.utcnow() + datetime.timedelta(minutes=duration)).isoformat()
+            coro = bulk_member_action(
+                job,
+                targets,
+                lambda user_id: self.bot.http.edit_member(guild.id, user_id, reason=reason, communication_disabled_until=until)
+            )
+
+        self._start(guild.id, job, coro)
+        return job
+
+    def _cancel(self, guild_id: int) -> discord.Embed:
+        job = self.jobs.get(guild_id)
+        if job is None or job.finished:
+            description = "There is no moderation job running in this server."
+        else:
+            job.cancel()
+            description = f"The `{job.kind}` job will stop after its current batch."
+
+        return discord.Embed(
+            title="Moderation",
+            description=description,
+            color=0xFFFFFF
+        )
+
+    @app_commands.command(name="purge", description="Deletes messages in this channel in bulk")
+    @app_commands.describe(
+        amount="How many recent messages to scan",
+        user="Only delete messages from this member",
+        contains="Only delete messages containing this text",
+        bots="Only delete messages from bots"
+    )
+    @app_commands.guild_only()
+    @app_commands.default_permissions(manage_messages=True)
+    @app_commands.checks.bot_has_permissions(manage_messages=True, read_message_history=True)
+    @app_cooldown(1, 15, key=lambda i: i.guild_id)
+    async def purge(
+        self,
+        interaction: discord.Interaction,
+        amount: app_commands.Range[int, 1, PURGE_MAX_MESSAGES],
+        user: discord.Member | None = None,
+        contains: str | None = None,
+        bots: bool = False
+    ):
+        busy = self._busy(interaction.guild_id)
+        if busy is not None:
+            await interaction.response.send_message(embed=busy, ephemeral=True)
+            return
+
+        job = self._purge_job(interaction.channel, amount, interaction.user.id, user, contains, bots)
+        await interaction.response.send_message(embed=job.embed(), view=ProgressView(job), ephemeral=True)
+        self._report(job, interaction.edit_original_response)
+
+    @commands.command(name="purge", aliases=["clear"], description="Deletes messages in this channel in bulk")
+    @commands.guild_only()
+    @commands.has_permissions(manage_messages=True)
+    @commands.bot_has_permissions(manage_messages=True, read_message_history=True)
+    @cooldown(1, 15, commands.BucketType.guild)
+    async def purge_cmd(self, ctx: commands.Context, amount: int, user: discord.Member | None = None, *, contains: str | None = None):
+        busy = self._busy(ctx.guild.id)
+        if busy is not None:
+            await ctx.send(embed=busy, delete_after=30)
+            return
+
+        job = self._purge_job(ctx.channel, amount, ctx.author.id, user, contains, False, before=ctx.message)
+        message = await ctx.send(embed=job.embed(), view=ProgressView(job))
+        self._report(job, message.edit)
+
+    @app_commands.command(name="mass", description="Bans, kicks or times out many members at once")
+    @app_commands.describe(
+        action="What to do with the members",
+        users="User mentions or IDs",
+        joined_within="Also target members who joined in the last N minutes",
+        duration="Timeout duration in minutes",
+        reason="Reason shown in the audit log"
+    )
+    @app_commands.guild_only()
+    @app_commands.default_permissions(ban_members=True)
+    @app_cooldown(1, 15, key=lambda i: i.guild_id)
+    async def mass(
+        self,
+        interaction: discord.Interaction,
+        action: Literal["ban", "kick", "timeout"],
+        users: str | None = None,
+        joined_within: app_commands.Range[int, 1, 1440] | None = None,
+        duration: app_commands.Range[int, 1, 40320] = 60,
+        reason: str | None = None
+    ):
+        permission = MASS_ACTION_PERMISSIONS[action]
+        if not getattr(interaction.permissions, permission):
+            raise app_commands.MissingPermissions([permission])
+
+        busy = self._busy(interaction.guild_id)
+        if busy is not None:
+            await interaction.response.send_message(embed=busy, ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        targets, skipped = await self._resolve_targets(interaction.guild, interaction.user, users, joined_within)
+        unavailable = self._unavailable(interaction.guild_id, targets, skipped)
+        if unavailable is not None:
+            await interaction.followup.send(embed=unavailable, ephemeral=True)
+            return
+
+        job = self._mass_job(
+            interaction.guild, action, targets, skipped, interaction.user.id, reason or f"Mass {action} by {interaction.user}", duration
+        )
+        await interaction.followup.send(embed=job.embed(), view=ProgressView(job), ephemeral=True)
+        self._report(job, interaction.edit_original_response)
+
+    @commands.command(name="mass", description="Bans, kicks or times out many members at once")
+    @commands.guild_only()
+    @cooldown(1, 15, commands.BucketType.guild)
+    async def mass_cmd(self, ctx: commands.Context, action: Literal["ban", "kick", "timeout"], *, users: str):
+        permission = MASS_ACTION_PERMISSIONS[action]
+        if not getattr(ctx.author.guild_permissions, permission):
+            raise commands.MissingPermissions([permission])
+
+        busy = self._busy(ctx.guild.id)
+        if busy is not None:
+            await ctx.send(embed=busy, delete_after=30)
+            return
+
+        targets, skipped = await self._resolve_targets(ctx.guild, ctx.author, users, None)
+        unavailable = self._unavailable(ctx.guild.id, targets, skipped)
+        if unavailable is not None:
+            await ctx.send(embed=unavailable, delete_after=30)
+            return
+
+        job = self._mass_job(ctx.guild, action, targets, skipped, ctx.author.id, f"Mass {action} by {ctx.author}", 60)
+        message = await ctx.send(embed=job.embed(), view=ProgressView(job))
+        self._report(job, message.edit)
+
+    @app_commands.command(name="cancel", description="Cancels the running moderation job")
+    @app_commands.guild_only()
+    @app_commands.default_permissions(manage_messages=True)
+    async def cancel(self, interaction: discord.Interaction):
+        await interaction.response.send_message(embed=self._cancel(interaction.guild_id), ephemeral=True)
 
+    @commands.command(name="cancel", description="Cancels the running moderation job")
+    @commands.guild_only()
+    @commands.has_permissions(manage_messages=True)
+    async def cancel_cmd(self, ctx: commands.Context):
+        await ctx.send(embed=self._cancel(ctx.guild.id), delete_after=30)
 
 async def setup(bot):
     await bot.add_cog(Moderation(bot))
@@ -1,5 +1,10 @@
+import io
+import time
 import discord
 from discord.ext import commands
+from src.utils.memory import memory_report
+
+PROFILE_MAX_SECONDS = 120
 
 class Owner(commands.Cog):
     def __init__(self, bot):
@@ -8,39 +13,89 @@ class Owner(commands.Cog):
     @commands.is_owner()
     @commands.command(name="sync", hidden=True)
     @commands.cooldown(1, 30, commands.BucketType.user)
-    async def sync(self, ctx: commands.Context):
-        await self.bot.tree.sync()
-        await ctx.send("Comandos sincronizados", delete_after=15)
+    async def sync(self, ctx: commands.Context, target: str = "global", force: bool = False):
+        guild = None
+        if target == "here":
+            guild = ctx.guild
+        elif target.isdigit():
+            guild = discord.Object(id=int(target))
+        if guild is not None:
+            self.bot.tree.copy_global_to(guild=guild)
 
-    @commands.is_owner()
-    @commands.command(name="reload", hidden=True)
-    @commands.cooldown(1, 30, commands.BucketType.user)
-    async def load_cog(self, ctx, cog: str):
+        result = await self.bot.tree.sync_changes(guild=guild, force=force)
+        self.bot.help_catalog.invalidate()
+
+        scope = "global" if guild is None else f"guild {guild.id}"
+        if not result.synced:
+            await ctx.send(f"Commands ({scope}) already up to date.", delete_after=15)
+            return
+
+        changes = [
+            f"{label}: {', '.join(f'`{name}`' for name in names)}"
+            for label, names in (("Added", result.added), ("Changed", result.changed), ("Removed", result.removed))
+            if names
+        ]
+        await ctx.send("\n".join([f"Commands ({scope}) synced.", *changes]), delete_after=30)
+
+    async def _manage_cog(self, ctx: commands.Context, action: str, cog: str) -> None:
+        operation = {
+            "load": self.bot.load_extension,
+            "unload": self.bot.unload_extension,
+            "reload": self.bot.reload_extension,
+        }[action]
+
+        start = time.perf_counter()
         try:
-            await self.bot.load_extension(f"cogs.{cog}")
-            await ctx.send(f"Cog {cog} loaded successfully.")
-        except Exception as e:
-            await ctx.send(f"Error loading cog {cog}: {e}")
-        
+            await operation(f"src.cogs.{cog}")
+        except commands.ExtensionError as e:
+            await ctx.send(f"Error during {action} of cog {cog}: {e.__cause__ or e}")
+            return
+
+        elapsed = (time.perf_counter() - start) * 1000
+        await ctx.send(f"Cog {cog} {action}ed successfully in {elapsed:.0f}ms.")
+
     @commands.is_owner()
     @commands.command(name="load", hidden=True)
     @commands.cooldown(1, 30, commands.BucketType.user)
-    async def load_cog(self, ctx, cog: str):
-        try:
-            await self.bot.load_extension(f"cogs.{cog}")
-            await ctx.send(f"Cog {cog} loaded successfully.")
-        except Exception as e:
-            await ctx.send(f"Error loading cog {cog}: {e}")
+    async def load_cog(self, ctx: commands.Context, cog: str):
+        await self._manage_cog(ctx, "load", cog)
+
+    @commands.is_owner()
+    @commands.command(name="unload", hidden=True)
+    @commands.cooldown(1, 30, commands.BucketType.user)
+    async def unload_cog(self, ctx: commands.Context, cog: str):
+        await self._manage_cog(ctx, "unload", cog)
 
     @commands.is_owner()
     @commands.command(name="reload", hidden=True)
     @commands.cooldown(1, 30, commands.BucketType.user)
-    async def reload_cog(self, ctx, cog: str):
-        try:
-            await self.bot.load_extension(f"cogs.{cog}")
-            await ctx.send(f"Cog {cog} loaded successfully.")
-        except Exception as e:
-            await ctx.send(f"Error loading cog {cog}: {e}")
+    async def reload_cog(self, ctx: commands.Context, cog: str):
+        await self._manage_cog(ctx, "reload", cog)
+
+    @commands.is_owner()
+    @commands.command(name="profile", hidden=True)
+    @commands.cooldown(1, 30, commands.BucketType.user)
+    async def profile(self, ctx: commands.Context, seconds: int = 30):
+        if self.bot.profiler.active:
+            await ctx.send("A profiling session is already running.", delete_after=15)
+            return
+
+        seconds = max(1, min(seconds, PROFILE_MAX_SECONDS))
+        await ctx.send(f"Profiling for {seconds}s…", delete_after=seconds)
+
+        report = await self.bot.profiler.sample(seconds)
+        file = discord.File(
+            io.BytesIO(report.encode("utf-8")),
+            filename=f"profile-{int(time.time())}.txt"
+        )
+        await ctx.send("Profiling finished.", file=file)
+
+    @commands.is_owner()
+    @commands.command(name="memory", hidden=True)
+    @commands.cooldown(1, 30, commands.BucketType.user)
+    async def memory(self, ctx: commands.Context):
+        report = memory_report(self.bot, self.bot.member_cache_policy)
+        await ctx.send(f"```\n{report}\n```")
 
 async def setup(bot):
     await bot.add_cog(Owner(bot))
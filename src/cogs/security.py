@@ -1,10 +1,132 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
+from src.utils.antispam import SECURITY_DETECTIONS, ActionBatcher
+from src.utils.logs import console_warn
+from src.utils.ratelimit import app_cooldown, cooldown
+from src.utils.spam import SpamDetector
+
+SECURITY_FEATURES = ("antispam", "antiraid")
 
 class Security(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.detector = SpamDetector()
+        self.actions = ActionBatcher(bot)
+
+    def export_state(self) -> dict:
+        return {"detector": self.detector, "actions": self.actions}
+
+    def import_state(self, state: dict) -> None:
+        self.detector = state["detector"]
+        self.actions = state["actions"]
+
+    async def cog_load(self) -> None:
+        self.actions.start()
+
+    async def cog_unload(self) -> None:
+        self.actions.stop()
+        await self.actions.flush()
+
+    async def _enabled(self, guild_id: int, feature: str) -> bool:
+        settings = await self.bot.settings.get(guild_id)
+        return bool(settings.get(feature))
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        if message.guild is None or message.author.bot:
+            return
+        if not isinstance(message.author, discord.Member) or message.author.guild_permissions.manage_messages:
+            return
+        if not await self._enabled(message.guild.id, "antispam"):
+            return
+
+        mentions = len(message.raw_mentions) + len(message.raw_role_mentions) + message.mention_everyone
+        verdict = self.detector.message(message.guild.id, message.author.id, message.content, mentions)
+        if verdict is None:
+            return
+
+        deleted = self.actions.delete(message)
+        timed_out = self.actions.timeout(message.author, verdict.reason)
+        if deleted or timed_out:
+            SECURITY_DETECTIONS.inc(reason=verdict.reason)
+        if timed_out:
+            self.bot.logger.warning(
+                "Spam detected in guild %s from %s: %s (%s)",
+                message.guild.id, message.author.id, verdict.reason, verdict.count
+            )
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member) -> None:
+        if member.bot or not await self._enabled(member.guild.id, "antiraid"):
+            return
+
+        verdict = self.detector.join(member.guild.id)
+        if verdict is not None:
+            SECURITY_DETECTIONS.inc(reason=verdict.reason)
+            console_warn(f"Raid detected in guild {member.guild.id} ({verdict.count} joins)")
+            self.bot.logger.warning("Raid detected in guild %s (%s joins)", member.guild.id, verdict.count)
+
+        if self.detector.in_raid(member.guild.id):
+            self.actions.timeout(member, "raid")
+
+    async def _update_security(self, guild: discord.Guild, changes: dict[str, bool]) -> discord.Embed:
+        if changes and self.bot.db is None:
+            return discord.Embed(
+                title="Security",
+                description="Settings are unavailable right now, try again later.",
+                color=0xFFFFFF
+            )
+
+        if changes:
+            await self.bot.settings.update(guild.id, **{feature: True if enabled else None for feature, enabled in changes.items()})
+
+        settings = await self.bot.settings.get(guild.id)
+        embed = discord.Embed(
+            title="Security",
+            color=0xFFFFFF
+        )
+
+        for feature in SECURITY_FEATURES:
+            embed.add_field(
+                name=feature,
+                value="enabled" if settings.get(feature) else "disabled",
+                inline=True
+            )
+
+        if self.detector.in_raid(guild.id):
+            embed.set_footer(text="raid mode active")
+
+        return embed
+
+    @app_commands.command(name="security", description="Shows or changes the anti-spam and anti-raid protection")
+    @app_commands.describe(antispam="Time out members who spam messages", antiraid="Time out members who join during a raid")
+    @app_commands.guild_only()
+    @app_commands.default_permissions(manage_guild=True)
+    @app_cooldown(1, 15, key=lambda i: i.guild_id)
+    async def security(self, interaction: discord.Interaction, antispam: bool | None = None, antiraid: bool | None = None):
+        changes = {
+            feature: enabled
+            for feature, enabled in (("antispam", antispam), ("antiraid", antiraid))
+            if enabled is not None
+        }
+        embed = await self._update_security(interaction.guild, changes)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @commands.command(name="security", description="Shows or changes the anti-spam and anti-raid protection")
+    @commands.guild_only()
+    @cooldown(1, 15, commands.BucketType.guild)
+    async def security_cmd(self, ctx: commands.Context, feature: str | None = None, enabled: bool | None = None):
+        changes = {}
+        if feature is not None:
+            if not ctx.author.guild_permissions.manage_guild:
+                raise commands.MissingPermissions(["manage_guild"])
+            if feature.lower() not in SECURITY_FEATURES or enabled is None:
+                raise commands.BadArgument(f"Use `{ctx.clean_prefix}security <antispam|antiraid> <on|off>`.")
+            changes[feature.lower()] = enabled
 
+        embed = await self._update_security(ctx.guild, changes)
+        await ctx.send(embed=embed)
 
 async def setup(bot):
     await bot.add_cog(Security(bot))
@@ -0,0 +1,111 @@
+import asyncio
+import datetime
+import logging
+
+import discord
+
+from src.utils.metrics import registry
+from src.utils.spam import TRACKED_USERS
+from src.utils.ttl import TTLCache
+
+ACTION_BATCH_INTERVAL = 1.0
+ACTION_COOLDOWN = 60
+TIMEOUT_DURATION = datetime.timedelta(minutes=10)
+BULK_DELETE_LIMIT = 100
+
+SECURITY_DETECTIONS = registry.counter(
+    "drew_security_detections_total", "Spam and raid detections by reason.", ("reason",)
+)
+SECURITY_ACTIONS = registry.counter(
+    "drew_security_actions_total", "Security actions applied by kind and outcome.", ("action", "result")
+)
+
+logger = logging.getLogger("drew.bot.security")
+
+class ActionBatcher:
+    """Collects deletions and timeouts and applies them in batches, one bulk delete per channel."""
+
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.deletes: dict[int, set[int]] = {}
+        self.timeouts: dict[tuple[int, int], tuple[discord.Member, str]] = {}
+        self.actioned = TTLCache(maxsize=TRACKED_USERS, ttl=ACTION_COOLDOWN)
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def delete(self, message: discord.Message) -> bool:
+        queued = self.deletes.setdefault(message.channel.id, set())
+        if message.id in queued:
+            return False
+
+        queued.add(message.id)
+        self._wake.set()
+        return True
+
+    def timeout(self, member: discord.Member, reason: str) -> bool:
+        key = (member.guild.id, member.id)
+        if self.actioned.get(key) is not None or key in self.timeouts:
+            return False
+
+        self.timeouts[key] = (member, reason)
+        self._wake.set()
+        return True
+
+    async def flush(self) -> None:
+        deletes, self.deletes = self.deletes, {}
+        timeouts, self.timeouts = self.timeouts, {}
+
+        await asyncio.gather(
+            *(self._delete(channel_id, message_ids) for channel_id, message_ids in deletes.items()),
+            *(self._timeout(member, reason) for member, reason in timeouts.values()),
+        )
+
+    async def _delete(self, channel_id: int, message_ids: set[int]) -> None:
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            return
+
+        ids = sorted(message_ids)
+        for start in range(0, len(ids), BULK_DELETE_LIMIT):
+            chunk = [discord.Object(id=message_id) for message_id in ids[start:start + BULK_DELETE_LIMIT]]
+            try:
+                if len(chunk) == 1:
+                    await channel.get_partial_message(chunk[0].id).delete()
+                else:
+                    await channel.delete_messages(chunk, reason="Spam detected")
+            except discord.NotFound:
+                continue
+            except discord.HTTPException as e:
+                SECURITY_ACTIONS.inc(action="delete", result="failed")
+                logger.warning("Failed to delete %s message(s) in channel %s: %s", len(chunk), channel_id, e)
+                return
+            SECURITY_ACTIONS.inc(action="delete", result="ok")
+
+    async def _timeout(self, member: discord.Member, reason: str) -> None:
+        self.actioned.set((member.guild.id, member.id), True)
+        try:
+            await member.timeout(TIMEOUT_DURATION, reason=f"Security: {reason}")
+        except discord.HTTPException as e:
+            SECURITY_ACTIONS.inc(action="timeout", result="failed")
+            logger.warning("Failed to time out %s in guild %s: %s", member.id, member.guild.id, e)
+            return
+        SECURITY_ACTIONS.inc(action="timeout", result="ok")
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._wake.wait()
+            await asyncio.sleep(ACTION_BATCH_INTERVAL)
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Security action batch failed")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
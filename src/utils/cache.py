@@ -0,0 +1,28 @@
+import time
+from typing import Any
+
+import redis.asyncio as aioredis
+from redis.asyncio.client import Pipeline
+
+from src.utils.metrics import REDIS_DURATION
+
+class InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True) -> list:
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            REDIS_DURATION.observe(time.perf_counter() - start, command="PIPELINE")
+
+class InstrumentedRedis(aioredis.Redis):
+    """Redis client that records the latency of every command it sends."""
+
+    async def execute_command(self, *args, **options) -> Any:
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_DURATION.observe(time.perf_counter() - start, command=str(args[0]).upper())
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
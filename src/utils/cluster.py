@@ -0,0 +1,91 @@
+import json
+import logging
+import time
+from typing import NamedTuple
+
+from discord.ext import tasks
+
+CLUSTER_STATS_KEY = "clusters:stats"
+CLUSTER_STATS_INTERVAL = 15
+CLUSTER_STATS_STALE_AFTER = CLUSTER_STATS_INTERVAL * 3
+
+logger = logging.getLogger("drew.bot.cluster")
+
+class ClusterTotals(NamedTuple):
+    clusters: int
+    guilds: int
+    users: int
+    channels: int
+    latency: float
+
+class ClusterStats:
+    """Publishes this process's guild stats to Redis and aggregates every cluster's."""
+
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self._totals: ClusterTotals | None = None
+        self._totals_at = 0.0
+
+    def local(self) -> ClusterTotals:
+        stats = self.bot.guild_stats
+        return ClusterTotals(1, stats.guilds, stats.users, stats.channels, self.bot.latency)
+
+    async def publish(self) -> None:
+        stats = self.bot.guild_stats
+        payload = {
+            "guilds": stats.guilds,
+            "users": stats.users,
+            "channels": stats.channels,
+            "latency": self.bot.latency,
+            "shards": list(self.bot.shards),
+            "updated": time.time(),
+        }
+        await self.bot.cache.hset(CLUSTER_STATS_KEY, str(self.bot.cluster_id), json.dumps(payload))
+
+    async def remove(self) -> None:
+        await self.bot.cache.hdel(CLUSTER_STATS_KEY, str(self.bot.cluster_id))
+
+    async def totals(self) -> ClusterTotals:
+        if self.bot.cluster_id is None or self.bot.cache is None:
+            return self.local()
+
+        if self._totals is not None and time.monotonic() - self._totals_at < CLUSTER_STATS_INTERVAL:
+            return self._totals
+
+        try:
+            entries = await self.bot.cache.hgetall(CLUSTER_STATS_KEY)
+        except Exception:
+            logger.exception("Cluster stats lookup failed")
+            return self._totals or self.local()
+
+        cutoff = time.time() - CLUSTER_STATS_STALE_AFTER
+        clusters = [json.loads(raw) for raw in entries.values()]
+        clusters = [c for c in clusters if c["updated"] >= cutoff] or [self.local()._asdict()]
+
+        self._totals = ClusterTotals(
+            clusters=len(clusters),
+            guilds=sum(c["guilds"] for c in clusters),
+            users=sum(c["users"] for c in clusters),
+            channels=sum(c["channels"] for c in clusters),
+            latency=sum(c["latency"] for c in clusters) / len(clusters),
+        )
+        self._totals_at = time.monotonic()
+        return self._totals
+
+    def start(self) -> None:
+        if not self.publish_loop.is_running():
+            self.publish_loop.start()
+
+    def stop(self) -> None:
+        self.publish_loop.cancel()
+
+    @tasks.loop(seconds=CLUSTER_STATS_INTERVAL)
+    async def publish_loop(self) -> None:
+        try:
+            await self.publish()
+        except Exception:
+            logger.exception("Cluster stats publish failed")
+
+    @publish_loop.before_loop
+    async def before_publish(self) -> None:
+        await self.bot.wait_until_ready()
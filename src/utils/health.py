@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import NamedTuple
+
+from discord.ext import tasks
+
+from src.utils.logs import console_info, console_warn
+from src.utils.probes import Latency, ProbeEngine
+
+HEALTH_INTERVAL_SECONDS = 60
+HEALTH_HISTORY_SIZE = 60
+HEARTBEAT_RETRY_SECONDS = 15
+HEARTBEAT_JITTER = 0.2
+
+logger = logging.getLogger("drew.bot.health")
+
+class ProbeSample(NamedTuple):
+    timestamp: float
+    latency: Latency
+
+class ProbeHistory:
+    def __init__(self, size: int = HEALTH_HISTORY_SIZE) -> None:
+        self.samples: deque[ProbeSample] = deque(maxlen=size)
+
+    def record(self, timestamp: float, latency: Latency) -> None:
+        self.samples.append(ProbeSample(timestamp, latency))
+
+    @property
+    def latest(self) -> ProbeSample | None:
+        return self.samples[-1] if self.samples else None
+
+    @property
+    def availability(self) -> float | None:
+        if not self.samples:
+            return None
+        return sum(isinstance(s.latency, int) for s in self.samples) / len(self.samples)
+
+    @property
+    def average_latency(self) -> float | None:
+        latencies = [s.latency for s in self.samples if isinstance(s.latency, int)]
+        if not latencies:
+            return None
+        return sum(latencies) / len(latencies)
+
+class Heartbeat:
+    """An outbound heartbeat URL pushed on its own interval, retried with jittered backoff on failure."""
+
+    def __init__(self, name: str, url: str, interval: float, requires: str | None = None) -> None:
+        self.name = name
+        self.url = url
+        self.interval = interval
+        self.requires = requires
+        self.failures = 0
+        self.next_at = 0.0
+
+    def schedule(self, now: float, ok: bool) -> None:
+        if ok:
+            self.failures = 0
+            delay = self.interval
+        else:
+            self.failures += 1
+            delay = min(HEARTBEAT_RETRY_SECONDS * 2 ** (self.failures - 1), self.interval)
+        self.next_at = now + delay * random.uniform(1 - HEARTBEAT_JITTER, 1)
+
+class HealthMonitor:
+    """Probes every dependency concurrently, keeps a rolling history and pushes heartbeats on their own timers."""
+
+    def __init__(self, bot, heartbeats: list[Heartbeat] | None = None) -> None:
+        self.bot = bot
+        self.engine = ProbeEngine(bot)
+        self.heartbeats = heartbeats or []
+        self.history = {name: ProbeHistory() for name in self.engine.probes}
+        self.results: dict[str, Latency] = {}
+        self.checked_at = 0.0
+        self._checking: asyncio.Task | None = None
+        self._heartbeat_tasks: list[asyncio.Task] = []
+
+    def cached(self, max_age: float = HEALTH_INTERVAL_SECONDS * 2) -> tuple[dict[str, Latency], float] | None:
+        if not self.results:
+            return None
+
+        age = time.time() - self.checked_at
+        if age > max_age:
+            return None
+        return self.results, age
+
+    def availability(self) -> dict[str, float | None]:
+        return {name: history.availability for name, history in self.history.items()}
+
+    async def check(self) -> dict[str, Latency]:
+        """Probe every dependency, sharing one run between concurrent callers."""
+        if self._checking is None or self._checking.done():
+            self._checking = asyncio.create_task(self._check())
+        return await asyncio.shield(self._checking)
+
+    async def _check(self) -> dict[str, Latency]:
+        results = await self.engine.run()
+        now = time.time()
+
+        for name, latency in results.items():
+            self.history[name].record(now, latency)
+
+        self.results = results
+        self.checked_at = now
+        return results
+
+    async def _push(self, heartbeat: Heartbeat) -> None:
+        ok = False
+        latency = None
+        if heartbeat.requires:
+            cached = self.cached(max_age=HEALTH_INTERVAL_SECONDS)
+            results = cached[0] if cached is not None else await self.check()
+            latency = results.get(heartbeat.requires)
+
+        if heartbeat.requires and not isinstance(latency, int):
+            console_warn(f"{heartbeat.name} heartbeat skipped ({latency})")
+            logger.warning("%s heartbeat skipped (%s)", heartbeat.name, latency)
+        else:
+            try:
+                async with self.bot.http_session.get(heartbeat.url) as r:
+                    ok = r.status == 200
+                    if not ok:
+                        console_warn(f"{heartbeat.name} heartbeat failed ({r.status})")
+                        logger.warning("%s heartbeat failed (%s)", heartbeat.name, r.status)
+            except Exception:
+                logger.exception("%s heartbeat error", heartbeat.name)
+
+        heartbeat.schedule(time.monotonic(), ok)
+
+    async def _heartbeat_loop(self, heartbeat: Heartbeat) -> None:
+        await self.bot.wait_until_ready()
+        while True:
+            await asyncio.sleep(max(heartbeat.next_at - time.monotonic(), 0.0))
+            try:
+                await self._push(heartbeat)
+            except Exception:
+                logger.exception("%s heartbeat error", heartbeat.name)
+                heartbeat.schedule(time.monotonic(), False)
+
+    def start(self) -> None:
+        if not self.monitor_loop.is_running():
+            self.monitor_loop.start()
+        if not self._heartbeat_tasks:
+            self._heartbeat_tasks = [asyncio.create_task(self._heartbeat_loop(heartbeat)) for heartbeat in self.heartbeats]
+
+    def stop(self) -> None:
+        self.monitor_loop.cancel()
+        for task in self._heartbeat_tasks:
+            task.cancel()
+        self._heartbeat_tasks = []
+
+    @tasks.loop(seconds=HEALTH_INTERVAL_SECONDS)
+    async def monitor_loop(self) -> None:
+        try:
+            await self.check()
+        except Exception:
+            logger.exception("Health check failed")
+
+    @monitor_loop.before_loop
+    async def before_monitor(self) -> None:
+        await self.bot.wait_until_ready()
+        console_info("Health monitor started")
+        logger.info("Health monitor started")
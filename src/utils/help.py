@@ -0,0 +1,158 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+from src.utils.ttl import TTLCache
+
+HELP_PAGE_SIZE = 10
+HELP_CACHE_SIZE = 512
+HELP_CACHE_TTL = 3600
+HELP_FOOTER = "Use each command as shown, or type help [command] for more details."
+
+SURFACES = {
+    "slash": "Here's a list of all available commands:",
+    "prefix": "Here's a list of all available prefix commands:",
+}
+
+class HelpCatalog:
+    """Help embeds built once per command set and reused until invalidated."""
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self._entries: dict[str, list[tuple[str, str]]] | None = None
+        self._index: dict[str, dict[str, object]] = {}
+        self._pages = TTLCache(maxsize=HELP_CACHE_SIZE, ttl=HELP_CACHE_TTL)
+        self._details = TTLCache(maxsize=HELP_CACHE_SIZE, ttl=HELP_CACHE_TTL)
+
+    def invalidate(self) -> None:
+        self._entries = None
+        self._index.clear()
+        self._pages.clear()
+        self._details.clear()
+
+    def _build(self) -> dict[str, list[tuple[str, str]]]:
+        if self._entries is not None:
+            return self._entries
+
+        slash_entries = []
+        slash_index = {}
+        for command in sorted(self.bot.tree.get_commands(), key=lambda c: c.name):
+            if command.description:
+                slash_entries.append((command.name, command.description))
+                slash_index[command.name.lower()] = command
+
+        prefix_entries = []
+        prefix_index = {}
+        for command in sorted(self.bot.commands, key=lambda c: c.name):
+            if command.hidden:
+                continue
+            prefix_entries.append((command.name, command.description))
+            for name in (command.name, *command.aliases):
+                prefix_index[name.lower()] = command
+
+        self._entries = {"slash": slash_entries, "prefix": prefix_entries}
+        self._index = {"slash": slash_index, "prefix": prefix_index}
+        return self._entries
+
+    def pages(self, surface: str, prefix: str = "/") -> list[discord.Embed]:
+        key = (surface, prefix)
+        cached = self._pages.get(key)
+        if cached is not None:
+            return cached
+
+        entries = self._build()[surface]
+        chunks = [entries[i:i + HELP_PAGE_SIZE] for i in range(0, len(entries), HELP_PAGE_SIZE)] or [[]]
+
+        pages = []
+        for number, chunk in enumerate(chunks, start=1):
+            embed = discord.Embed(
+                title="Commands",
+                description=SURFACES[surface],
+                color=0xFFFFFF
+            )
+
+            for name, description in chunk:
+                embed.add_field(
+                    name=f"{prefix}{name}",
+                    value=description or "No description",
+                    inline=False
+                )
+
+            footer = HELP_FOOTER
+            if len(chunks) > 1:
+                footer = f"{footer} • page {number}/{len(chunks)}"
+            embed.set_footer(text=footer)
+            pages.append(embed)
+
+        self._pages.set(key, pages)
+        return pages
+
+    def detail(self, surface: str, name: str, prefix: str = "/") -> discord.Embed | None:
+        name = name.strip().lower().removeprefix(prefix.lower())
+        key = (surface, prefix, name)
+        cached = self._details.get(key)
+        if cached is not None:
+            return cached
+
+        self._build()
+        command = self._index[surface].get(name)
+        if command is None:
+            return None
+
+        embed = discord.Embed(
+            title=f"{prefix}{command.name}",
+            description=command.description or "No description",
+            color=0xFFFFFF
+        )
+
+        if isinstance(command, app_commands.Command):
+            parameters = "\n".join(
+                f"`{param.display_name}`{'' if param.required else ' (optional)'}: {param.description}"
+                for param in command.parameters
+            )
+            if parameters:
+                embed.add_field(name="Options", value=parameters, inline=False)
+        elif isinstance(command, commands.Command):
+            usage = f"{prefix}{command.qualified_name} {command.signature}".strip()
+            embed.add_field(
+                name="Usage",
+                value=f"`{usage}`",
+                inline=False
+            )
+            if command.aliases:
+                embed.add_field(
+                    name="Aliases",
+                    value=", ".join(f"`{alias}`" for alias in command.aliases),
+                    inline=False
+                )
+
+        self._details.set(key, embed)
+        return embed
+
+class HelpPaginator(discord.ui.View):
+    def __init__(self, pages: list[discord.Embed], author_id: int, timeout: float = 120) -> None:
+        super().__init__(timeout=timeout)
+        self.pages = pages
+        self.author_id = author_id
+        self.index = 0
+        self._update_buttons()
+
+    def _update_buttons(self) -> None:
+        self.previous_page.disabled = self.index == 0
+        self.next_page.disabled = self.index >= len(self.pages) - 1
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.author_id
+
+    async def _show(self, interaction: discord.Interaction) -> None:
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.pages[self.index], view=self)
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        self.index = max(self.index - 1, 0)
+        await self._show(interaction)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        self.index = min(self.index + 1, len(self.pages) - 1)
+        await self._show(interaction)
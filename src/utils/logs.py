@@ -0,0 +1,167 @@
+import copy
+import json
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from rgbprint import gradient_print, Color
+
+LOG_DIRECTORY = "src/logging"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+LOG_FLUSH_EVERY = 64
+
+CONSOLE_COLORS = {
+    logging.INFO: ("INFO", Color.blue),
+    logging.WARNING: ("WARNING", Color.yellow),
+    logging.ERROR: ("ERROR", Color.red),
+}
+
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener: QueueListener | None = None
+
+console_logger = logging.getLogger("drew.console")
+console_logger.setLevel(logging.INFO)
+console_logger.propagate = False
+
+class LocalQueueHandler(QueueHandler):
+    """Queues records for the writer thread, keeping the exception text apart from the message."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class JsonFormatter(logging.Formatter):
+    def __init__(self, **fields) -> None:
+        super().__init__()
+        self.fields = fields
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **self.fields,
+        }
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False)
+
+class BatchedFileHandler(RotatingFileHandler):
+    """Rotating file handler that leaves flushing to the writer thread instead of flushing per record."""
+
+    def __init__(self, filename: str, flush_every: int = LOG_FLUSH_EVERY, **kwargs) -> None:
+        super().__init__(filename, **kwargs)
+        self.flush_every = flush_every
+        self._pending = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+
+            self.stream.write(self.format(record) + self.terminator)
+            self._pending += 1
+            if self._pending >= self.flush_every or record.levelno >= logging.ERROR:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        super().flush()
+        self._pending = 0
+
+class ConsoleHandler(logging.Handler):
+    def __init__(self, gradient: bool = True) -> None:
+        super().__init__()
+        self.gradient = gradient
+
+    def emit(self, record: logging.LogRecord) -> None:
+        label, color = CONSOLE_COLORS.get(record.levelno, ("INFO", Color.blue))
+        message = f"[{label}] {record.getMessage()}"
+        try:
+            if self.gradient:
+                gradient_print(message, start_color=Color.white, end_color=color)
+            else:
+                print(message, flush=True)
+        except Exception:
+            self.handleError(record)
+
+class BatchingQueueListener(QueueListener):
+    """Queue listener that flushes its handlers whenever the queue drains."""
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        try:
+            return self.queue.get(block=False)
+        except queue.Empty:
+            for handler in self.handlers:
+                handler.flush()
+            return self.queue.get(block=block)
+
+console_logger.addHandler(LocalQueueHandler(_queue))
+
+def setup_logging(
+    logger: logging.Logger,
+    filename: str = "bot.log",
+    json_output: bool = True,
+    gradient: bool = True,
+    **fields,
+) -> None:
+    global _listener
+
+    if _listener is not None:
+        return
+
+    os.makedirs(LOG_DIRECTORY, exist_ok=True)
+
+    file_handler = BatchedFileHandler(
+        os.path.join(LOG_DIRECTORY, filename),
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding="utf-8",
+    )
+    if json_output:
+        file_handler.setFormatter(JsonFormatter(**fields))
+    else:
+        file_handler.setFormatter(
+            logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+        )
+    file_handler.addFilter(logging.Filter(logger.name))
+
+    console_handler = ConsoleHandler(gradient=gradient)
+    console_handler.addFilter(logging.Filter(console_logger.name))
+
+    logger.setLevel(logging.INFO)
+    logger.addHandler(LocalQueueHandler(_queue))
+
+    _listener = BatchingQueueListener(_queue, file_handler, console_handler)
+    _listener.start()
+
+def stop_logging() -> None:
+    global _listener
+
+    if _listener is None:
+        return
+
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+def console_info(message: str) -> None:
+    console_logger.info(message)
+
+def console_warn(message: str) -> None:
+    console_logger.warning(message)
+
+def console_error(message: str) -> None:
+    console_logger.error(message)
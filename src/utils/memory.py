@@ -0,0 +1,109 @@
+import asyncio
+import itertools
+import sys
+from typing import Iterable
+
+import discord
+import psutil
+
+MEMBER_CACHE_FLAGS = ("voice", "joined")
+FOOTPRINT_SAMPLE_SIZE = 200
+PRIMITIVES = (str, bytes, int, float, bool, type(None))
+
+def member_cache_flags(policy: str) -> discord.MemberCacheFlags:
+    """Build member cache flags from a comma separated policy such as ``voice,joined``, ``all`` or ``none``."""
+    names = {name.strip().lower() for name in policy.split(",") if name.strip()}
+    if "all" in names:
+        return discord.MemberCacheFlags.all()
+    if not names or "none" in names:
+        return discord.MemberCacheFlags.none()
+
+    unknown = names.difference(MEMBER_CACHE_FLAGS)
+    if unknown:
+        raise ValueError(f"Unknown member cache policy: {', '.join(sorted(unknown))}")
+    return discord.MemberCacheFlags(**{name: True for name in names})
+
+_chunk_locks: dict[int, asyncio.Lock] = {}
+
+async def ensure_chunked(guild: discord.Guild) -> None:
+    """Chunk a guild's member list on first need instead of for every guild at startup."""
+    if guild.chunked:
+        return
+
+    lock = _chunk_locks.setdefault(guild.id, asyncio.Lock())
+    try:
+        async with lock:
+            if not guild.chunked:
+                await guild.chunk(cache=True)
+    finally:
+        if not lock.locked():
+            _chunk_locks.pop(guild.id, None)
+
+def _attributes(obj) -> Iterable:
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            value = getattr(obj, name, None)
+            if value is not None:
+                yield value
+    yield from getattr(obj, "__dict__", {}).values()
+
+def shallow_sizeof(obj) -> int:
+    """Size of an object plus the primitives and containers it owns, ignoring references to other models."""
+    size = sys.getsizeof(obj)
+    for value in _attributes(obj):
+        if isinstance(value, PRIMITIVES):
+            size += sys.getsizeof(value)
+        elif isinstance(value, (tuple, list, set, frozenset, dict)):
+            size += sys.getsizeof(value)
+    return size
+
+def estimate(objects: Iterable, count: int, sample: int = FOOTPRINT_SAMPLE_SIZE) -> int:
+    sampled = list(itertools.islice(objects, sample))
+    if not sampled:
+        return 0
+    return round(sum(shallow_sizeof(obj) for obj in sampled) / len(sampled) * count)
+
+def cache_footprint(bot) -> list[tuple[str, int, int]]:
+    """Estimated ``(cache, entries, bytes)`` for each of the client's caches."""
+    # Guild.members, .channels and .roles copy (and sort) on every access, so count and sample the backing dicts.
+    guilds = bot.guilds
+    members = sum(len(guild._members) for guild in guilds)
+    channels = sum(len(guild._channels) for guild in guilds)
+    roles = sum(len(guild._roles) for guild in guilds)
+    users = bot.users
+    messages = bot.cached_messages
+
+    caches = [
+        ("guilds", guilds, len(guilds)),
+        ("members", itertools.chain.from_iterable(guild._members.values() for guild in guilds), members),
+        ("users", users, len(users)),
+        ("channels", itertools.chain.from_iterable(guild._channels.values() for guild in guilds), channels),
+        ("roles", itertools.chain.from_iterable(guild._roles.values() for guild in guilds), roles),
+        ("emojis", bot.emojis, len(bot.emojis)),
+        ("stickers", bot.stickers, len(bot.stickers)),
+        ("messages", messages, len(messages)),
+    ]
+    return [(name, count, estimate(objects, count)) for name, objects, count in caches]
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GiB"
+
+def memory_report(bot, policy: str) -> str:
+    rss = psutil.Process().memory_info().rss
+    footprint = cache_footprint(bot)
+    chunked = sum(1 for guild in bot.guilds if guild.chunked)
+
+    lines = [
+        f"RSS: {format_bytes(rss)}",
+        f"Member cache policy: {policy}",
+        f"Chunked guilds: {chunked}/{len(bot.guilds)}",
+        "",
+        f"{'cache':<10} {'entries':>10} {'estimate':>12}",
+    ]
+    lines.extend(f"{name:<10} {count:>10} {format_bytes(size):>12}" for name, count, size in footprint)
+    lines.append(f"{'total':<10} {sum(count for _, count, _ in footprint):>10} {format_bytes(sum(size for _, _, size in footprint)):>12}")
+    return "\n".join(lines)
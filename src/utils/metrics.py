@@ -0,0 +1,248 @@
+import bisect
+import logging
+import threading
+from typing import Callable
+
+from pymongo import monitoring
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger("drew.bot.metrics")
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(name, "") for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        for key, value in list(self.values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self.values.clear()
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: tuple[float, ...] = DEFAULT_BUCKETS, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = buckets
+        self.values: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        for key, (counts, total, count) in list(self.values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class Registry:
+    """In-process metric registry rendered in the Prometheus text exposition format."""
+
+    def __init__(self) -> None:
+        self.metrics: list[Metric] = []
+        self.collectors: list[Callable[[], None]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        metric = Gauge(name, documentation, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets=buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self.collectors:
+            try:
+                collector()
+            except Exception:
+                logger.exception("Metrics collector failed")
+
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+COMMAND_DURATION = registry.histogram(
+    "drew_command_duration_seconds", "Command handler wall time.", ("type", "command")
+)
+COMMAND_ERRORS = registry.counter(
+    "drew_command_errors_total", "Commands that ended in an error.", ("type", "command")
+)
+GATEWAY_SEQUENCE = registry.gauge(
+    "drew_gateway_sequence", "Gateway dispatch sequence of the current session; resets when a shard identifies again.", ("shard",)
+)
+GATEWAY_LATENCY = registry.gauge(
+    "drew_gateway_latency_seconds", "Gateway heartbeat latency.", ("shard",)
+)
+REDIS_DURATION = registry.histogram(
+    "drew_redis_command_duration_seconds", "Redis command latency.", ("command",)
+)
+MONGO_DURATION = registry.histogram(
+    "drew_mongo_command_duration_seconds", "MongoDB command latency.", ("command",)
+)
+MONGO_ERRORS = registry.counter(
+    "drew_mongo_command_errors_total", "MongoDB commands that failed.", ("command",)
+)
+LOOP_LAG = registry.gauge(
+    "drew_event_loop_lag_seconds", "Event loop scheduling lag from the latest system sample."
+)
+CACHE_ENTRIES = registry.gauge(
+    "drew_cache_entries", "Entries held by in-process TTL caches.", ("cache",)
+)
+CACHE_HITS = registry.counter(
+    "drew_cache_hits_total", "In-process TTL cache hits.", ("cache",)
+)
+CACHE_MISSES = registry.counter(
+    "drew_cache_misses_total", "In-process TTL cache misses, including expired entries.", ("cache",)
+)
+CACHE_EVICTIONS = registry.counter(
+    "drew_cache_evictions_total", "In-process TTL cache entries evicted to stay within maxsize.", ("cache",)
+)
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        MONGO_DURATION.observe(event.duration_micros / 1_000_000, command=event.command_name)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        MONGO_DURATION.observe(event.duration_micros / 1_000_000, command=event.command_name)
+        MONGO_ERRORS.inc(command=event.command_name)
+
+def collect_bot_metrics(bot) -> Callable[[], None]:
+    reported: dict[tuple, float] = {}
+
+    def advance(counter: Counter, total: float, **labels) -> None:
+        """Feed a cumulative total into a counter; a total below the last one means the source restarted."""
+        key = (counter.name, *counter._key(labels))
+        last = reported.get(key, 0)
+        counter.inc(total - last if total >= last else total, **labels)
+        reported[key] = total
+
+    def collect() -> None:
+        for shard_id, info in bot.shards.items():
+            GATEWAY_LATENCY.set(info.latency, shard=shard_id)
+            ws = getattr(getattr(info, "_parent", None), "ws", None)
+            sequence = getattr(ws, "sequence", None)
+            if sequence is not None:
+                GATEWAY_SEQUENCE.set(sequence, shard=shard_id)
+
+        snapshot = bot.system_stats.latest
+        if snapshot is not None:
+            LOOP_LAG.set(snapshot.loop_lag)
+
+        events = bot.get_cog("Events")
+        if events is not None:
+            stats = events.notices.stats()
+            CACHE_ENTRIES.set(stats["size"], cache="notices")
+            advance(CACHE_HITS, stats["hits"], cache="notices")
+            advance(CACHE_MISSES, stats["misses"], cache="notices")
+            advance(CACHE_EVICTIONS, stats["evictions"], cache="notices")
+
+    return collect
+
+class MetricsServer:
+    def __init__(self, host: str, port: int, metrics: Registry = registry) -> None:
+        self.host = host
+        self.port = port
+        self.registry = metrics
+        self._runner = None
+
+    async def _handle(self, request):
+        from aiohttp import web
+
+        return web.Response(text=self.registry.render(), content_type="text/plain")
+
+    async def start(self) -> None:
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,197 @@
+import asyncio
+import datetime
+import logging
+import time
+from typing import Awaitable, Callable, Iterable
+
+import discord
+
+from src.utils.metrics import registry
+
+BULK_DELETE_LIMIT = 100
+BULK_BAN_LIMIT = 200
+BULK_DELETE_MAX_AGE = datetime.timedelta(days=14) - datetime.timedelta(minutes=1)
+MEMBER_ACTION_CONCURRENCY = 4
+MEMBER_ACTION_CHUNK = 25
+PROGRESS_INTERVAL = 2.0
+
+MODERATION_ACTIONS = registry.counter(
+    "drew_moderation_actions_total", "Bulk moderation actions applied by kind and outcome.", ("action", "result")
+)
+
+logger = logging.getLogger("drew.bot.moderation")
+
+class ModerationJob:
+    """A bulk moderation run that reports progress and stops between chunks once cancelled."""
+
+    def __init__(self, kind: str, total: int, author_id: int) -> None:
+        self.kind = kind
+        self.total = total
+        self.author_id = author_id
+        self.processed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.skipped = 0
+        self.cancelled = False
+        self.error: str | None = None
+        self.started_at = time.monotonic()
+        self.task: asyncio.Task | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.task is not None and self.task.done()
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def describe(self) -> str:
+        elapsed = time.monotonic() - self.started_at
+        status = "cancelled" if self.cancelled else "finished" if self.finished else "running"
+        lines = [
+            f"{self.kind}: {status} after {elapsed:.0f}s",
+            f"processed: {self.processed}/{self.total}",
+            f"succeeded: {self.succeeded}",
+            f"failed: {self.failed}",
+        ]
+        if self.skipped:
+            lines.append(f"skipped (role hierarchy): {self.skipped}")
+        if self.error:
+            lines.append(f"error: {self.error}")
+        return "\n".join(lines)
+
+    def embed(self) -> discord.Embed:
+        return discord.Embed(
+            title="Moderation",
+            description=f"```\n{self.describe()}\n```",
+            color=0xFFFFFF
+        )
+
+class ProgressView(discord.ui.View):
+    def __init__(self, job: ModerationJob) -> None:
+        super().__init__(timeout=None)
+        self.job = job
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.job.author_id
+
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary)
+    async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        self.job.cancel()
+        button.disabled = True
+        await interaction.response.edit_message(view=self)
+
+async def report_progress(job: ModerationJob, edit: Callable[..., Awaitable]) -> None:
+    """Edit the progress message periodically until the job ends, then once more without the cancel button."""
+    while not job.finished:
+        await asyncio.wait({job.task}, timeout=PROGRESS_INTERVAL)
+        try:
+            if job.finished:
+                await edit(embed=job.embed(), view=None)
+            else:
+                await edit(embed=job.embed())
+        except discord.HTTPException as e:
+            logger.warning("Failed to update moderation progress: %s", e)
+
+async def purge_messages(
+    job: ModerationJob,
+    channel: discord.abc.Messageable,
+    check: Callable[[discord.Message], bool],
+    before: discord.abc.Snowflake | None = None,
+) -> None:
+    """Delete matching messages among the latest ``job.total``, 100 per bulk delete when they are recent enough."""
+    cutoff = discord.utils.utcnow() - BULK_DELETE_MAX_AGE
+    pending: list[discord.Message] = []
+
+    async def flush() -> None:
+        batch = pending[:]
+        pending.clear()
+        try:
+            await channel.delete_messages(batch, reason=f"Purge by {job.author_id}")
+        except discord.NotFound:
+            job.succeeded += len(batch)
+        except discord.HTTPException as e:
+            job.failed += len(batch)
+            job.error = str(e)
+            MODERATION_ACTIONS.inc(action="purge", result="failed")
+        else:
+            job.succeeded += len(batch)
+            MODERATION_ACTIONS.inc(action="purge", result="ok")
+
+    async for message in channel.history(limit=job.total, before=before):
+        if job.cancelled:
+            break
+
+        job.processed += 1
+        if not check(message):
+            continue
+
+        if message.created_at < cutoff:
+            try:
+                await message.delete()
+                job.succeeded += 1
+            except discord.NotFound:
+                job.succeeded += 1
+            except discord.HTTPException:
+                job.failed += 1
+            continue
+
+        pending.append(message)
+        if len(pending) == BULK_DELETE_LIMIT:
+            await flush()
+
+    if pending and not job.cancelled:
+        await flush()
+
+def chunked(items: list, size: int) -> Iterable[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+async def bulk_ban(job: ModerationJob, guild: discord.Guild, user_ids: list[int], reason: str, delete_seconds: int = 0) -> None:
+    for chunk in chunked(user_ids, BULK_BAN_LIMIT):
+        if job.cancelled:
+            return
+
+        try:
+            result = await guild.bulk_ban(
+                [discord.Object(id=user_id) for user_id in chunk],
+                reason=reason,
+                delete_message_seconds=delete_seconds,
+            )
+        except discord.HTTPException as e:
+            job.processed += len(chunk)
+            job.failed += len(chunk)
+            job.error = str(e)
+            MODERATION_ACTIONS.inc(action="ban", result="failed")
+            continue
+
+        job.processed += len(chunk)
+        job.succeeded += len(result.banned)
+        job.failed += len(result.failed)
+        MODERATION_ACTIONS.inc(action="ban", result="ok")
+
+async def bulk_member_action(
+    job: ModerationJob,
+    user_ids: list[int],
+    action: Callable[[int], Awaitable],
+) -> None:
+    """Apply a per-member action with bounded concurrency; Discord has no bulk endpoint for kicks or timeouts."""
+    semaphore = asyncio.Semaphore(MEMBER_ACTION_CONCURRENCY)
+
+    async def run(user_id: int) -> None:
+        async with semaphore:
+            try:
+                await action(user_id)
+            except discord.HTTPException as e:
+                job.failed += 1
+                job.error = str(e)
+                MODERATION_ACTIONS.inc(action=job.kind, result="failed")
+            else:
+                job.succeeded += 1
+                MODERATION_ACTIONS.inc(action=job.kind, result="ok")
+            finally:
+                job.processed += 1
+
+    for chunk in chunked(user_ids, MEMBER_ACTION_CHUNK):
+        if job.cancelled:
+            return
+        await asyncio.gather(*(run(user_id) for user_id in chunk))
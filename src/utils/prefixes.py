@@ -0,0 +1,27 @@
+MAX_PREFIX_LENGTH = 5
+
+class PrefixStore:
+    """Per-guild command prefixes backed by the guild settings repository."""
+
+    def __init__(self, bot, default: str) -> None:
+        self.bot = bot
+        self.default = default
+
+    def cached(self, guild_id: int | None) -> str | None:
+        if guild_id is None:
+            return self.default
+
+        settings = self.bot.settings.cached(guild_id)
+        if settings is None:
+            return None
+        return settings.get("prefix") or self.default
+
+    async def get(self, guild_id: int | None) -> str:
+        if guild_id is None:
+            return self.default
+
+        settings = await self.bot.settings.get(guild_id)
+        return settings.get("prefix") or self.default
+
+    async def set(self, guild_id: int, prefix: str) -> None:
+        await self.bot.settings.update(guild_id, prefix=None if prefix == self.default else prefix)
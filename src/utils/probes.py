@@ -0,0 +1,67 @@
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Callable
+
+from discord.http import Route
+
+EXTERNAL_API_URL = "https://api.neevets.website"
+
+PROBE_TIMEOUTS = {
+    "REST": 5.0,
+    "API": 5.0,
+    "Database": 3.0,
+    "Cache": 2.0,
+}
+
+Latency = int | str
+
+class ProbeEngine:
+    """Runs every backend latency probe concurrently, each under its own deadline."""
+
+    def __init__(self, bot, timeouts: dict[str, float] | None = None) -> None:
+        self.bot = bot
+        self.timeouts = timeouts or PROBE_TIMEOUTS
+        self.probes: dict[str, Callable[[], Awaitable[object]]] = {
+            "REST": self._probe_rest,
+            "API": self._probe_api,
+            "Database": self._probe_database,
+            "Cache": self._probe_cache,
+        }
+
+    async def _probe_rest(self) -> None:
+        await self.bot.http.request(Route("GET", "/users/@me"))
+
+    async def _probe_api(self) -> None:
+        async with self.bot.http_session.get(EXTERNAL_API_URL):
+            pass
+
+    async def _probe_database(self) -> None:
+        await self.bot.db.command("ping")
+
+    async def _probe_cache(self) -> None:
+        await self.bot.cache.ping()
+
+    async def measure(self, name: str) -> tuple[str, Latency]:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.probes[name](), timeout=self.timeouts.get(name, 5.0))
+        except asyncio.TimeoutError:
+            return name, "Timeout"
+        except Exception:
+            return name, "Error"
+        return name, round((time.perf_counter() - start) * 1000)
+
+    def start(self) -> list[asyncio.Task]:
+        return [asyncio.create_task(self.measure(name)) for name in self.probes]
+
+    async def stream(self, tasks: list[asyncio.Task] | None = None) -> AsyncIterator[tuple[str, Latency]]:
+        tasks = tasks if tasks is not None else self.start()
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def run(self) -> dict[str, Latency]:
+        return dict(await asyncio.gather(*self.start()))
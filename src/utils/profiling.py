@@ -0,0 +1,122 @@
+import asyncio
+import io
+import time
+import types
+from typing import Any, Coroutine
+
+from src.utils.metrics import registry
+
+COMMAND_RUNNING = registry.histogram(
+    "drew_command_running_seconds", "Time a command spent running on the event loop.", ("type", "command")
+)
+
+class CommandProfile:
+    """Wall time of one invocation split into time running on the loop and time spent awaiting."""
+
+    __slots__ = ("started_at", "wall", "running")
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.wall = 0.0
+        self.running = 0.0
+
+    @property
+    def awaiting(self) -> float:
+        return max(self.wall - self.running, 0.0)
+
+    @types.coroutine
+    def _step(self, coro: Coroutine) -> Any:
+        iterator = coro.__await__()
+        value, error = None, None
+
+        while True:
+            start = time.perf_counter()
+            try:
+                if error is None:
+                    future = iterator.send(value)
+                else:
+                    future = iterator.throw(error)
+            except StopIteration as stop:
+                self.running += time.perf_counter() - start
+                return stop.value
+            finally:
+                error = None
+            self.running += time.perf_counter() - start
+
+            try:
+                value = yield future
+            except GeneratorExit:
+                iterator.close()
+                raise
+            except BaseException as e:
+                value, error = None, e
+
+    async def run(self, coro: Coroutine) -> Any:
+        try:
+            return await self._step(coro)
+        finally:
+            self.wall = time.perf_counter() - self.started_at
+
+class CommandStats:
+    __slots__ = ("count", "wall", "running", "max_wall")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.wall = 0.0
+        self.running = 0.0
+        self.max_wall = 0.0
+
+class CommandProfiler:
+    """Aggregates per-command profiles and runs on-demand cProfile sessions."""
+
+    def __init__(self) -> None:
+        self.commands: dict[tuple[str, str], CommandStats] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self._lock.locked()
+
+    def record(self, kind: str, name: str, profile: CommandProfile) -> None:
+        stats = self.commands.get((kind, name))
+        if stats is None:
+            stats = self.commands[(kind, name)] = CommandStats()
+
+        stats.count += 1
+        stats.wall += profile.wall
+        stats.running += profile.running
+        stats.max_wall = max(stats.max_wall, profile.wall)
+        COMMAND_RUNNING.observe(profile.running, type=kind, command=name)
+
+    def summary(self, limit: int = 25) -> str:
+        rows = sorted(self.commands.items(), key=lambda item: item[1].running, reverse=True)[:limit]
+        lines = [f"{'command':<30} {'calls':>7} {'avg wall':>10} {'avg run':>10} {'avg await':>10} {'max wall':>10}"]
+        for (kind, name), stats in rows:
+            wall = stats.wall / stats.count
+            running = stats.running / stats.count
+            lines.append(
+                f"{f'{kind}:{name}':<30} {stats.count:>7} {wall * 1000:>8.1f}ms {running * 1000:>8.1f}ms "
+                f"{(wall - running) * 1000:>8.1f}ms {stats.max_wall * 1000:>8.1f}ms"
+            )
+        return "\n".join(lines)
+
+    async def sample(self, seconds: float, limit: int = 40) -> str:
+        import cProfile
+        import pstats
+
+        async with self._lock:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                profiler.disable()
+
+        output = io.StringIO()
+        output.write(f"Profile window: {seconds}s\n\n")
+        stats = pstats.Stats(profiler, stream=output)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(limit)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        output.write("\nCommand profiles\n\n")
+        output.write(self.summary())
+        return output.getvalue()
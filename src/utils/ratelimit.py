@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Hashable
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from src.utils.ttl import TTLCache
+from src.utils.metrics import registry
+
+RATELIMIT_PREFIX = "ratelimit:"
+RATELIMIT_LOCAL_SIZE = 50_000
+
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local per = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local interval = per / rate
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or rate
+local ts = tonumber(state[2]) or now
+tokens = math.min(rate, tokens + math.max(now - ts, 0) / interval)
+
+if tokens < 1 then
+    return math.ceil((1 - tokens) * interval)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], per)
+return 0
+"""
+
+RATELIMIT_CHECKS = registry.counter(
+    "drew_ratelimit_checks_total", "Cooldown checks by where they were answered and their outcome.", ("source", "result")
+)
+
+logger = logging.getLogger("drew.bot.ratelimit")
+
+class RateLimiter:
+    """Token-bucket cooldowns shared through Redis, with checks batched into one pipeline per loop tick."""
+
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.limited = TTLCache(maxsize=RATELIMIT_LOCAL_SIZE)
+        self.fallback = TTLCache(maxsize=RATELIMIT_LOCAL_SIZE)
+        self._script = None
+        self._queue: list[tuple[str, int, float, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+
+    async def hit(self, key: str, rate: int, per: float) -> float:
+        """Consume one token from ``key`` and return the seconds to wait, or 0 if allowed."""
+        deadline = self.limited.get(key)
+        if deadline is not None:
+            RATELIMIT_CHECKS.inc(source="local", result="limited")
+            return max(deadline - time.monotonic(), 0.001)
+
+        if self.bot.cache is None:
+            return self._hit_local(key, rate, per)
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((key, rate, per, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+
+        retry_after = await future
+        if retry_after:
+            self.limited.set(key, time.monotonic() + retry_after, ttl=retry_after)
+        return retry_after
+
+    def _hit_local(self, key: str, rate: int, per: float) -> float:
+        cooldown = self.fallback.get(key)
+        if cooldown is None:
+            cooldown = commands.Cooldown(rate, per)
+            self.fallback.set(key, cooldown, ttl=per)
+
+        retry_after = cooldown.update_rate_limit() or 0.0
+        RATELIMIT_CHECKS.inc(source="memory", result="limited" if retry_after else "allowed")
+        return retry_after
+
+    async def _flush(self) -> None:
+        batch, self._queue = self._queue, []
+        self._flush_task = None
+
+        if self._script is None:
+            self._script = self.bot.cache.register_script(TOKEN_BUCKET_SCRIPT)
+
+        try:
+            async with self.bot.cache.pipeline(transaction=False) as pipe:
+                for key, rate, per, _ in batch:
+                    await self._script(keys=[f"{RATELIMIT_PREFIX}{key}"], args=[rate, int(per * 1000)], client=pipe)
+                results = await pipe.execute()
+        except Exception as e:
+            logger.warning("Rate limit batch of %s failed, using in-memory cooldowns: %s", len(batch), e)
+            for key, rate, per, future in batch:
+                if not future.done():
+                    future.set_result(self._hit_local(key, rate, per))
+            return
+
+        for (_, _, _, future), retry_ms in zip(batch, results):
+            retry_after = int(retry_ms) / 1000
+            RATELIMIT_CHECKS.inc(source="redis", result="limited" if retry_after else "allowed")
+            if not future.done():
+                future.set_result(retry_after)
+
+def cooldown(rate: int, per: float, type: commands.BucketType = commands.BucketType.user) -> Callable:
+    """Drop-in replacement for ``commands.cooldown`` whose buckets are shared by every process."""
+    bucket = commands.Cooldown(rate, per)
+
+    async def predicate(ctx: commands.Context) -> bool:
+        bucket_key = type.get_key(ctx.message)
+        if bucket_key is None:
+            return True
+
+        retry_after = await ctx.bot.ratelimits.hit(f"{ctx.command.qualified_name}:{bucket_key}", rate, per)
+        if retry_after:
+            raise commands.CommandOnCooldown(bucket, retry_after, type)
+        return True
+
+    return commands.check(predicate)
+
+def app_cooldown(
+    rate: int, per: float, *, key: Callable[[discord.Interaction], Hashable] | None = lambda i: i.user.id
+) -> Callable:
+    """Drop-in replacement for ``app_commands.checks.cooldown`` whose buckets are shared by every process."""
+    bucket = app_commands.Cooldown(rate, per)
+
+    async def predicate(interaction: discord.Interaction) -> bool:
+        bucket_key = key(interaction) if key is not None else None
+        if bucket_key is None:
+            return True
+
+        retry_after = await interaction.client.ratelimits.hit(
+            f"{interaction.command.qualified_name}:{bucket_key}", rate, per
+        )
+        if retry_after:
+            raise app_commands.CommandOnCooldown(bucket, retry_after)
+        return True
+
+    return app_commands.check(predicate)
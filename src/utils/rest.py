@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import re
+import time
+
+import aiohttp
+
+from src.utils.ttl import TTLCache
+from src.utils.metrics import registry
+
+REST_HOST = "discord.com"
+REST_GLOBAL_LIMIT = 50
+REST_PREFIX = "rest:"
+REST_LOCAL_SIZE = 10_000
+REST_LOCK_TTL = 300
+
+MAJOR_PARAMETER = re.compile(r"^/api/v\d+/(?:channels|guilds|webhooks)/(\d+)(?:/([\w-]{60,}))?")
+SNOWFLAKE = re.compile(r"/\d{15,}")
+TOKEN = re.compile(r"/[\w-]{60,}")
+GLOBAL_EXEMPT = re.compile(r"^/api/v\d+/(?:interactions/\d+/|webhooks/\d+/[\w-]{60,})")
+
+GLOBAL_RESERVE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+
+local start = now
+local blocked = redis.call('PTTL', KEYS[2])
+if blocked > 0 then
+    start = now + blocked
+end
+
+local tat = tonumber(redis.call('GET', KEYS[1])) or start
+tat = math.max(tat, start) + interval
+redis.call('SET', KEYS[1], tat, 'PX', math.ceil(tat - now) + 1000)
+return math.max(tat - burst - now, 0)
+"""
+
+BUCKET_ACQUIRE_SCRIPT = """
+local remaining = tonumber(redis.call('HGET', KEYS[1], 'remaining'))
+if remaining == nil then
+    return 0
+end
+if remaining > 0 then
+    redis.call('HINCRBY', KEYS[1], 'remaining', -1)
+    return 0
+end
+return math.max(redis.call('PTTL', KEYS[1]), 1)
+"""
+
+BUCKET_UPDATE_SCRIPT = """
+local remaining = tonumber(ARGV[1])
+local current = tonumber(redis.call('HGET', KEYS[1], 'remaining'))
+if current ~= nil and current < remaining and redis.call('PTTL', KEYS[1]) > 0 then
+    remaining = current
+end
+redis.call('HSET', KEYS[1], 'remaining', remaining)
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+return remaining
+"""
+
+REST_WAIT = registry.histogram(
+    "drew_rest_ratelimit_wait_seconds",
+    "Time outbound Discord REST requests were queued by the shared rate limiter.",
+    ("scope",),
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+REST_RATELIMITED = registry.counter(
+    "drew_rest_ratelimited_total", "Discord REST responses with status 429.", ("scope",)
+)
+
+logger = logging.getLogger("drew.bot.rest")
+
+def route_key(method: str, path: str) -> tuple[str, str]:
+    """Split a REST path into its route template and major parameter, as Discord buckets them."""
+    major = ""
+    match = MAJOR_PARAMETER.match(path)
+    if match is not None:
+        major = ":".join(group for group in match.groups() if group)
+        path = path[:match.start(1)] + "{major}" + path[match.end():]
+
+    path = TOKEN.sub("/{token}", path)
+    return f"{method} {SNOWFLAKE.sub('/{id}', path)}", major
+
+def global_exempt(path: str) -> bool:
+    """Interaction callbacks and webhook token endpoints do not count against the global limit."""
+    return GLOBAL_EXEMPT.match(path) is not None
+
+class RestCoordinator:
+    """Shares Discord REST bucket state and the global limit between every process through Redis.
+
+    Hooked into discord.py's HTTP session as a trace config: requests wait in FIFO order per bucket,
+    reserve a slot of the global limit, and every response updates the shared bucket state.
+    """
+
+    def __init__(self, bot, global_limit: int = REST_GLOBAL_LIMIT) -> None:
+        self.bot = bot
+        self.interval = 1000 / global_limit
+        self.burst = 1000
+        self.routes = TTLCache(maxsize=REST_LOCAL_SIZE, ttl=3600)
+        self.locks = TTLCache(maxsize=REST_LOCAL_SIZE, ttl=REST_LOCK_TTL)
+        self._scripts = None
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        return trace
+
+    def _prepare_scripts(self) -> tuple:
+        if self._scripts is None:
+            self._scripts = (
+                self.bot.cache.register_script(GLOBAL_RESERVE_SCRIPT),
+                self.bot.cache.register_script(BUCKET_ACQUIRE_SCRIPT),
+                self.bot.cache.register_script(BUCKET_UPDATE_SCRIPT),
+            )
+        return self._scripts
+
+    async def _bucket_key(self, route: str, major: str) -> str | None:
+        bucket = self.routes.get(route)
+        if bucket is None:
+            bucket = await self.bot.cache.hget(f"{REST_PREFIX}routes", route)
+            if bucket is None:
+                return None
+            if isinstance(bucket, bytes):
+                bucket = bucket.decode()
+            self.routes.set(route, bucket)
+        return f"{REST_PREFIX}bucket:{bucket}:{major}"
+
+    def _lock(self, key: str) -> asyncio.Lock:
+        lock = self.locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self.locks.set(key, lock)
+        return lock
+
+    async def acquire(self, method: str, path: str) -> None:
+        reserve, acquire_bucket, _ = self._prepare_scripts()
+        route, major = route_key(method, path)
+        start = time.perf_counter()
+
+        bucket_key = await self._bucket_key(route, major)
+        if bucket_key is not None:
+            async with self._lock(bucket_key):
+                while True:
+                    wait = await acquire_bucket(keys=[bucket_key])
+                    if not wait:
+                        break
+                    await asyncio.sleep(wait / 1000)
+            REST_WAIT.observe(time.perf_counter() - start, scope="bucket")
+
+        if global_exempt(path):
+            return
+
+        start = time.perf_counter()
+        delay = await reserve(
+            keys=[f"{REST_PREFIX}global:tat", f"{REST_PREFIX}global:blocked"],
+            args=[self.interval, self.burst],
+        )
+        if delay:
+            await asyncio.sleep(float(delay) / 1000)
+        REST_WAIT.observe(time.perf_counter() - start, scope="global")
+
+    async def update(self, method: str, path: str, status: int, headers) -> None:
+        _, _, update_bucket = self._prepare_scripts()
+        route, major = route_key(method, path)
+
+        if status == 429:
+            retry_after = float(headers.get("Retry-After", 1))
+            scope = headers.get("X-RateLimit-Scope", "user")
+            REST_RATELIMITED.inc(scope=scope)
+            if headers.get("X-RateLimit-Global") or scope == "global":
+                await self.bot.cache.set(f"{REST_PREFIX}global:blocked", 1, px=max(int(retry_after * 1000), 1))
+                return
+
+        bucket = headers.get("X-RateLimit-Bucket")
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if bucket is None or remaining is None or reset_after is None:
+            return
+
+        if self.routes.get(route) != bucket:
+            self.routes.set(route, bucket)
+            await self.bot.cache.hset(f"{REST_PREFIX}routes", route, bucket)
+
+        await update_bucket(
+            keys=[f"{REST_PREFIX}bucket:{bucket}:{major}"],
+            args=[0 if status == 429 else int(remaining), max(int(float(reset_after) * 1000), 1)],
+        )
+
+    def _applies(self, url) -> bool:
+        return self.bot.cache is not None and url.host == REST_HOST and url.path.startswith("/api/")
+
+    async def _on_request_start(self, session, context, params: aiohttp.TraceRequestStartParams) -> None:
+        if not self._applies(params.url):
+            return
+
+        try:
+            await self.acquire(params.method, params.url.path)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Shared REST rate limiter unavailable for %s %s", params.method, params.url.path)
+
+    async def _on_request_end(self, session, context, params: aiohttp.TraceRequestEndParams) -> None:
+        if not self._applies(params.url):
+            return
+
+        try:
+            await self.update(params.method, params.url.path, params.response.status, params.response.headers)
+        except Exception:
+            logger.exception("Shared REST rate limit update failed for %s %s", params.method, params.url.path)
@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import time
+from typing import Any
+
+from bson import json_util
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
+
+from src.utils.ttl import TTLCache
+
+SETTINGS_COLLECTION = "guild_settings"
+SETTINGS_CACHE_SIZE = 50_000
+SETTINGS_CACHE_TTL = 3600
+SETTINGS_RETRY_TTL = 30
+SETTINGS_REDIS_PREFIX = "guild_settings:"
+SETTINGS_VERSION_PREFIX = "guild_settings:version:"
+SETTINGS_REDIS_TTL = 300
+SETTINGS_FLUSH_INTERVAL = 1.0
+CHANGE_STREAM_UNSUPPORTED = 40573
+CHANGE_STREAM_MAX_BACKOFF = 60
+
+CACHE_IF_CURRENT_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+logger = logging.getLogger("drew.bot.settings")
+
+class GuildSettingsRepository:
+    """Guild settings read through a local LRU and Redis, written to MongoDB in coalesced batches."""
+
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.local = TTLCache(maxsize=SETTINGS_CACHE_SIZE, ttl=SETTINGS_CACHE_TTL)
+        self._pending: dict[int, asyncio.Future] = {}
+        self._writes: dict[int, dict[str, Any]] = {}
+        self._batch: asyncio.Future | None = None
+        self._evicted = TTLCache(maxsize=SETTINGS_CACHE_SIZE, ttl=SETTINGS_REDIS_TTL)
+        self._cache_script = None
+        self._wake = asyncio.Event()
+        self._flush_task: asyncio.Task | None = None
+        self._flushing: asyncio.Task | None = None
+        self._watch_task: asyncio.Task | None = None
+
+    @property
+    def collection(self):
+        return self.bot.db.get_collection(SETTINGS_COLLECTION)
+
+    def _redis_key(self, guild_id: int) -> str:
+        return f"{SETTINGS_REDIS_PREFIX}{guild_id}"
+
+    def _version_key(self, guild_id: int) -> str:
+        return f"{SETTINGS_VERSION_PREFIX}{guild_id}"
+
+    def cached(self, guild_id: int) -> dict | None:
+        return self.local.get(guild_id)
+
+    async def get(self, guild_id: int) -> dict:
+        settings = self.local.get(guild_id)
+        if settings is not None:
+            return settings
+
+        pending = self._pending.get(guild_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[guild_id] = future
+        started_at = time.monotonic()
+        try:
+            settings = await self._load(guild_id)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception:
+            logger.exception("Settings lookup failed for guild %s", guild_id)
+            settings = {}
+            self.local.set(guild_id, settings, ttl=SETTINGS_RETRY_TTL)
+        else:
+            # An eviction during the load means the document read may predate the latest write.
+            if self._evicted.get(guild_id, 0.0) < started_at:
+                self.local.set(guild_id, settings)
+        finally:
+            del self._pending[guild_id]
+
+        future.set_result(settings)
+        return settings
+
+    async def _load(self, guild_id: int) -> dict:
+        key = self._redis_key(guild_id)
+        version_key = self._version_key(guild_id)
+        version = None
+
+        if self.bot.cache is not None:
+            try:
+                raw, version = await self.bot.cache.mget(key, version_key)
+                if raw is not None:
+                    return json_util.loads(raw)
+            except Exception:
+                logger.exception("Settings cache read failed for guild %s", guild_id)
+
+        if self.bot.db is None:
+            return {}
+
+        document = await self.collection.find_one({"_id": guild_id}) or {}
+        document.pop("_id", None)
+
+        if self.bot.cache is not None:
+            if self._cache_script is None:
+                self._cache_script = self.bot.cache.register_script(CACHE_IF_CURRENT_SCRIPT)
+            if isinstance(version, bytes):
+                version = version.decode()
+            try:
+                await self._cache_script(
+                    keys=[key, version_key],
+                    args=[version or "", json_util.dumps(document), SETTINGS_REDIS_TTL],
+                )
+            except Exception:
+                logger.exception("Settings cache write failed for guild %s", guild_id)
+
+        return document
+
+    def update(self, guild_id: int, **values: Any) -> asyncio.Future:
+        """Queue a write; a value of ``None`` unsets the field. The returned future resolves once persisted."""
+        if self._flush_task is None:
+            raise RuntimeError("Guild settings repository is not running")
+
+        self._writes.setdefault(guild_id, {}).update(values)
+
+        cached = self.local.get(guild_id)
+        if cached is not None:
+            merged = {**cached, **values}
+            self.local.set(guild_id, {k: v for k, v in merged.items() if v is not None})
+
+        if self._batch is None:
+            self._batch = asyncio.get_running_loop().create_future()
+        self._wake.set()
+        return self._batch
+
+    async def flush(self) -> None:
+        if not self._writes:
+            return
+
+        writes, self._writes = self._writes, {}
+        batch, self._batch = self._batch, None
+
+        requests = []
+        for guild_id, values in writes.items():
+            update = {}
+            set_fields = {k: v for k, v in values.items() if v is not None}
+            unset_fields = {k: "" for k, v in values.items() if v is None}
+            if set_fields:
+                update["$set"] = set_fields
+            if unset_fields:
+                update["$unset"] = unset_fields
+            requests.append(UpdateOne({"_id": guild_id}, update, upsert=True))
+
+        try:
+            await self.collection.bulk_write(requests, ordered=False)
+        except Exception as e:
+            logger.exception("Settings flush failed for %s guild(s)", len(requests))
+            if batch is not None and not batch.done():
+                batch.set_exception(e)
+            return
+        finally:
+            await self._invalidate(list(writes))
+
+        if batch is not None and not batch.done():
+            batch.set_result(len(requests))
+
+    async def _invalidate(self, guild_ids: list[int]) -> None:
+        """Drop cached copies and bump each guild's version so in-flight loads cannot cache an older document."""
+        now = time.monotonic()
+        for guild_id in guild_ids:
+            self.local.pop(guild_id)
+            self._evicted.set(guild_id, now)
+
+        if self.bot.cache is None or not guild_ids:
+            return
+
+        try:
+            async with self.bot.cache.pipeline(transaction=True) as pipe:
+                for guild_id in guild_ids:
+                    pipe.delete(self._redis_key(guild_id))
+                    pipe.incr(self._version_key(guild_id))
+                    pipe.expire(self._version_key(guild_id), SETTINGS_REDIS_TTL)
+                await pipe.execute()
+        except Exception:
+            logger.exception("Settings cache eviction failed")
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._wake.wait()
+            await asyncio.sleep(SETTINGS_FLUSH_INTERVAL)
+            self._wake.clear()
+            self._flushing = asyncio.create_task(self.flush())
+            await asyncio.shield(self._flushing)
+
+    async def _watch_loop(self) -> None:
+        pipeline = [
+            {"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}},
+            {"$project": {"documentKey": 1}},
+        ]
+        resume_token = None
+        delay = 1
+
+        while True:
+            try:
+                async with self.collection.watch(pipeline, resume_after=resume_token) as stream:
+                    delay = 1
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        await self._invalidate([change["documentKey"]["_id"]])
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAM_UNSUPPORTED:
+                    logger.warning("Change streams unavailable, settings rely on cache TTLs")
+                    return
+                logger.exception("Settings change stream failed")
+                resume_token = None
+                self.local.clear()
+            except Exception:
+                logger.exception("Settings change stream failed")
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, CHANGE_STREAM_MAX_BACKOFF)
+
+    def start(self) -> None:
+        if self.bot.db is None or self._flush_task is not None:
+            return
+
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        self._watch_task = asyncio.create_task(self._watch_loop())
+
+    async def close(self) -> None:
+        for task in (self._flush_task, self._watch_task):
+            if task is not None:
+                task.cancel()
+        self._flush_task = self._watch_task = None
+
+        if self._flushing is not None and not self._flushing.done():
+            await self._flushing
+        await self.flush()
@@ -0,0 +1,142 @@
+import re
+import time
+from typing import NamedTuple
+
+from src.utils.ttl import TTLCache
+
+WINDOW_RESOLUTION = 1.0
+MESSAGE_WINDOW = 5
+MESSAGE_LIMIT = 7
+DUPLICATE_WINDOW = 10
+DUPLICATE_LIMIT = 4
+DUPLICATE_HISTORY = 8
+MENTION_WINDOW = 10
+MENTION_LIMIT = 10
+CROSS_USER_DUPLICATE_LIMIT = 6
+CROSS_USER_MIN_LENGTH = 20
+JOIN_WINDOW = 10
+JOIN_LIMIT = 10
+RAID_DURATION = 300
+TRACKED_USERS = 200_000
+TRACKED_CONTENT = 100_000
+TRACKED_GUILDS = 50_000
+IDLE_TTL = 60
+
+WHITESPACE = re.compile(r"\s+")
+LINK = re.compile(r"https?://|discord\.gg/", re.IGNORECASE)
+
+class SlidingWindow:
+    """Event counter over the last ``size`` seconds kept in a ring of fixed-resolution buckets."""
+
+    __slots__ = ("counts", "slots")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.slots = [-1] * size
+
+    def add(self, now: float, amount: int = 1) -> int:
+        slot = int(now / WINDOW_RESOLUTION)
+        index = slot % len(self.counts)
+        if self.slots[index] != slot:
+            self.slots[index] = slot
+            self.counts[index] = 0
+        self.counts[index] += amount
+        return self.count(now)
+
+    def count(self, now: float) -> int:
+        oldest = int(now / WINDOW_RESOLUTION) - len(self.counts)
+        return sum(count for count, slot in zip(self.counts, self.slots) if slot > oldest)
+
+class UserActivity:
+    __slots__ = ("messages", "mentions", "hashes", "stamps", "cursor")
+
+    def __init__(self) -> None:
+        self.messages = SlidingWindow(MESSAGE_WINDOW)
+        self.mentions = SlidingWindow(MENTION_WINDOW)
+        self.hashes = [0] * DUPLICATE_HISTORY
+        self.stamps = [0.0] * DUPLICATE_HISTORY
+        self.cursor = 0
+
+    def remember(self, digest: int, now: float) -> int:
+        """Store ``digest`` and return how many recent messages, including this one, share it."""
+        self.hashes[self.cursor] = digest
+        self.stamps[self.cursor] = now
+        self.cursor = (self.cursor + 1) % DUPLICATE_HISTORY
+
+        since = now - DUPLICATE_WINDOW
+        return sum(1 for value, stamp in zip(self.hashes, self.stamps) if value == digest and stamp > since)
+
+class Verdict(NamedTuple):
+    reason: str
+    count: int
+
+def normalise(content: str) -> str:
+    return WHITESPACE.sub(" ", content).strip().casefold()
+
+class SpamDetector:
+    """Per-message and per-join checks in constant time, with bounded memory and idle entries expiring."""
+
+    def __init__(self) -> None:
+        self.users = TTLCache(maxsize=TRACKED_USERS, ttl=IDLE_TTL)
+        self.content = TTLCache(maxsize=TRACKED_CONTENT, ttl=DUPLICATE_WINDOW)
+        self.joins = TTLCache(maxsize=TRACKED_GUILDS, ttl=IDLE_TTL)
+        self.raids = TTLCache(maxsize=TRACKED_GUILDS, ttl=RAID_DURATION)
+
+    def message(self, guild_id: int, user_id: int, content: str, mentions: int) -> Verdict | None:
+        now = time.monotonic()
+        key = (guild_id, user_id)
+        activity = self.users.get(key)
+        if activity is None:
+            activity = UserActivity()
+        self.users.set(key, activity)
+
+        count = activity.messages.add(now)
+        if count > MESSAGE_LIMIT:
+            return Verdict("message rate", count)
+
+        if mentions:
+            count = activity.mentions.add(now, mentions)
+            if count > MENTION_LIMIT:
+                return Verdict("mass mention", count)
+
+        if not content:
+            return None
+
+        text = normalise(content)
+        digest = hash(text)
+        count = activity.remember(digest, now)
+        if count >= DUPLICATE_LIMIT:
+            return Verdict("duplicate content", count)
+
+        # Short greetings like "gm" are repeated by many members in normal chat.
+        if len(text) < CROSS_USER_MIN_LENGTH and not mentions and not LINK.search(text):
+            return None
+
+        content_key = (guild_id, digest)
+        authors = self.content.get(content_key)
+        if authors is None:
+            authors = set()
+            self.content.set(content_key, authors)
+        authors.add(user_id)
+        if len(authors) >= CROSS_USER_DUPLICATE_LIMIT:
+            return Verdict("coordinated duplicate content", len(authors))
+
+        return None
+
+    def join(self, guild_id: int) -> Verdict | None:
+        """Record a join and return a verdict when it starts raid mode for the guild."""
+        now = time.monotonic()
+        window = self.joins.get(guild_id)
+        if window is None:
+            window = SlidingWindow(JOIN_WINDOW)
+        self.joins.set(guild_id, window)
+
+        count = window.add(now)
+        if count < JOIN_LIMIT or self.in_raid(guild_id):
+            return None
+
+        self.raids.set(guild_id, now)
+        return Verdict("join rate", count)
+
+    def in_raid(self, guild_id: int) -> bool:
+        return self.raids.get(guild_id) is not None
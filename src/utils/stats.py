@@ -0,0 +1,59 @@
+import discord
+
+class ShardCounters:
+    __slots__ = ("guilds", "users", "channels")
+
+    def __init__(self) -> None:
+        self.guilds = 0
+        self.users = 0
+        self.channels = 0
+
+class GuildStats:
+    """Guild, user and channel totals kept per shard and updated from gateway events."""
+
+    def __init__(self) -> None:
+        self.shards: dict[int, ShardCounters] = {}
+        self.guilds = 0
+        self.users = 0
+        self.channels = 0
+
+    def _apply(self, shard_id: int, guilds: int = 0, users: int = 0, channels: int = 0) -> None:
+        counters = self.shards.get(shard_id)
+        if counters is None:
+            counters = self.shards[shard_id] = ShardCounters()
+
+        counters.guilds += guilds
+        counters.users += users
+        counters.channels += channels
+
+        self.guilds += guilds
+        self.users += users
+        self.channels += channels
+
+    def rebuild(self, guilds: list[discord.Guild]) -> None:
+        self.shards.clear()
+        self.guilds = self.users = self.channels = 0
+
+        for guild in guilds:
+            self.add_guild(guild)
+
+    def add_guild(self, guild: discord.Guild) -> None:
+        self._apply(guild.shard_id, 1, guild.member_count or 0, len(guild.channels))
+
+    def remove_guild(self, guild: discord.Guild) -> None:
+        self._apply(guild.shard_id, -1, -(guild.member_count or 0), -len(guild.channels))
+
+    def add_member(self, guild: discord.Guild) -> None:
+        self._apply(guild.shard_id, users=1)
+
+    def remove_member(self, guild: discord.Guild) -> None:
+        self._apply(guild.shard_id, users=-1)
+
+    def add_channel(self, guild: discord.Guild) -> None:
+        self._apply(guild.shard_id, channels=1)
+
+    def remove_channel(self, guild: discord.Guild) -> None:
+        self._apply(guild.shard_id, channels=-1)
+
+    def shard(self, shard_id: int) -> ShardCounters:
+        return self.shards.get(shard_id) or ShardCounters()
@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import NamedTuple
+
+import psutil
+from discord.ext import tasks
+
+SAMPLE_INTERVAL_SECONDS = 5
+SAMPLE_BUFFER_SIZE = 60
+
+logger = logging.getLogger("drew.bot.system")
+
+class SystemSnapshot(NamedTuple):
+    timestamp: float
+    cpu_percent: float
+    ram_total: int
+    ram_used: int
+    disk_total: int
+    disk_used: int
+    loop_lag: float
+
+class SystemSampler:
+    """Samples host statistics in the background into a fixed-size ring buffer."""
+
+    def __init__(self, size: int = SAMPLE_BUFFER_SIZE, path: str = "/") -> None:
+        self.path = path
+        self.snapshots: deque[SystemSnapshot] = deque(maxlen=size)
+        psutil.cpu_percent(interval=None)
+
+    @property
+    def latest(self) -> SystemSnapshot | None:
+        return self.snapshots[-1] if self.snapshots else None
+
+    def _read(self, loop_lag: float) -> SystemSnapshot:
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.path)
+        return SystemSnapshot(
+            timestamp=time.time(),
+            cpu_percent=psutil.cpu_percent(interval=None),
+            ram_total=memory.total,
+            ram_used=memory.used,
+            disk_total=disk.total,
+            disk_used=disk.used,
+            loop_lag=loop_lag,
+        )
+
+    async def sample(self) -> SystemSnapshot:
+        start = time.perf_counter()
+        await asyncio.sleep(0)
+        loop_lag = time.perf_counter() - start
+
+        snapshot = await asyncio.to_thread(self._read, loop_lag)
+        self.snapshots.append(snapshot)
+        return snapshot
+
+    def average(self, seconds: float) -> SystemSnapshot | None:
+        cutoff = time.time() - seconds
+        window = [s for s in self.snapshots if s.timestamp >= cutoff]
+        if not window:
+            return None
+
+        count = len(window)
+        return SystemSnapshot(
+            timestamp=window[-1].timestamp,
+            cpu_percent=sum(s.cpu_percent for s in window) / count,
+            ram_total=window[-1].ram_total,
+            ram_used=sum(s.ram_used for s in window) // count,
+            disk_total=window[-1].disk_total,
+            disk_used=sum(s.disk_used for s in window) // count,
+            loop_lag=sum(s.loop_lag for s in window) / count,
+        )
+
+    def start(self) -> None:
+        if not self.sample_loop.is_running():
+            self.sample_loop.start()
+
+    def stop(self) -> None:
+        self.sample_loop.cancel()
+
+    @tasks.loop(seconds=SAMPLE_INTERVAL_SECONDS)
+    async def sample_loop(self) -> None:
+        try:
+            await self.sample()
+        except Exception:
+            logger.exception("System sample failed")
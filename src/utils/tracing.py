@@ -0,0 +1,110 @@
+import contextlib
+import contextvars
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Iterator
+
+COMMAND_OPS = ("command.prefix", "command.slash")
+DEFAULT_TRACES_SAMPLE_RATE = 0.1
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="drew-sentry")
+_sentry = None
+
+def _to_seconds(value) -> float | None:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+def traces_sampler(sampling_context: dict) -> float:
+    op = sampling_context.get("transaction_context", {}).get("op")
+
+    if op in COMMAND_OPS:
+        return 1.0
+    if op == "http.server":
+        return 0.0
+
+    parent_sampled = sampling_context.get("parent_sampled")
+    if parent_sampled is not None:
+        return float(parent_sampled)
+    return DEFAULT_TRACES_SAMPLE_RATE
+
+class CommandTransactionFilter:
+    """Keeps every slow or failed command transaction and a sample of fast, successful ones."""
+
+    def __init__(self, fast_sample_rate: float, slow_threshold: float) -> None:
+        self.fast_sample_rate = fast_sample_rate
+        self.slow_threshold = slow_threshold
+
+    def __call__(self, event: dict, hint: dict) -> dict | None:
+        trace = event.get("contexts", {}).get("trace", {})
+        if trace.get("op") not in COMMAND_OPS:
+            return event
+
+        if trace.get("status") not in (None, "ok"):
+            return event
+
+        start = _to_seconds(event.get("start_timestamp"))
+        end = _to_seconds(event.get("timestamp"))
+        if start is None or end is None or end - start >= self.slow_threshold:
+            return event
+
+        return event if random.random() < self.fast_sample_rate else None
+
+def setup_sentry(dsn: str | None, fast_sample_rate: float, slow_threshold: float) -> None:
+    global _sentry
+
+    if not dsn or _sentry is not None:
+        return
+
+    import sentry_sdk
+    from sentry_sdk.integrations.aiohttp import AioHttpIntegration
+    from sentry_sdk.integrations.asyncio import AsyncioIntegration
+    from sentry_sdk.integrations.pymongo import PyMongoIntegration
+    from sentry_sdk.integrations.redis import RedisIntegration
+
+    sentry_sdk.init(
+        dsn=dsn,
+        traces_sampler=traces_sampler,
+        before_send_transaction=CommandTransactionFilter(fast_sample_rate, slow_threshold),
+        integrations=[
+            AsyncioIntegration(),
+            AioHttpIntegration(),
+            RedisIntegration(),
+            PyMongoIntegration(),
+        ],
+    )
+    _sentry = sentry_sdk
+
+@contextlib.contextmanager
+def command_transaction(kind: str, name: str | None) -> Iterator:
+    if name is None or _sentry is None:
+        yield None
+        return
+
+    with _sentry.start_transaction(op=f"command.{kind}", name=f"{kind}:{name}") as transaction:
+        transaction.set_tag("command.type", kind)
+        yield transaction
+
+def finish_transaction(transaction, failed: bool) -> None:
+    if transaction is not None:
+        transaction.set_status("internal_error" if failed else "ok")
+
+def report_exception(error: BaseException) -> None:
+    if _sentry is None:
+        return
+
+    context = contextvars.copy_context()
+    _executor.submit(context.run, _sentry.capture_exception, error)
+
+def report_message(message: str, **kwargs) -> None:
+    if _sentry is not None:
+        _sentry.capture_message(message, **kwargs)
+
+def flush_sentry(timeout: float = 2) -> None:
+    if _sentry is not None:
+        _sentry.flush(timeout=timeout)
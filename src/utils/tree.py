@@ -0,0 +1,194 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Any, NamedTuple
+
+import discord
+from discord import app_commands
+
+from src.utils.metrics import COMMAND_DURATION, COMMAND_ERRORS, registry
+from src.utils.profiling import CommandProfile
+from src.utils.tracing import command_transaction, finish_transaction
+
+TREE_FINGERPRINT_PREFIX = "tree:commands:"
+ACK_DEADLINE_SECONDS = 3.0
+ACK_BUDGET_SECONDS = 2.0
+# discord.py has no public hook to replace Interaction.response; it is cached in this private slot (checked on 2.7).
+RESPONSE_SLOT = "_cs_response"
+
+INTERACTION_ACK = registry.histogram(
+    "drew_interaction_ack_seconds",
+    "Time from interaction creation to its first response.",
+    ("command", "deferred"),
+    buckets=(0.1, 0.25, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 5.0),
+)
+INTERACTION_DEADLINE_MISSES = registry.counter(
+    "drew_interaction_deadline_misses_total",
+    "Interactions not acknowledged within Discord's three second deadline.",
+    ("command",),
+)
+
+logger = logging.getLogger("drew.bot.tree")
+
+class SyncResult(NamedTuple):
+    synced: bool
+    added: list[str]
+    changed: list[str]
+    removed: list[str]
+
+class BudgetedResponse(discord.InteractionResponse):
+    """Interaction response that the tree can defer on the handler's behalf, routing later sends to followups."""
+
+    def __init__(self, parent: discord.Interaction) -> None:
+        super().__init__(parent)
+        self.lock = asyncio.Lock()
+        self.auto_deferred = False
+        self.acknowledged_at: float | None = None
+
+    def _acknowledged(self) -> None:
+        if self.acknowledged_at is None:
+            self.acknowledged_at = time.time()
+
+    async def auto_defer(self, ephemeral: bool) -> None:
+        async with self.lock:
+            if self.is_done():
+                return
+            await super().defer(ephemeral=ephemeral, thinking=True)
+            self.auto_deferred = True
+            self._acknowledged()
+
+    async def defer(self, **kwargs) -> Any:
+        async with self.lock:
+            if self.auto_deferred:
+                return None
+            result = await super().defer(**kwargs)
+            self._acknowledged()
+            return result
+
+    async def send_message(self, *args, delete_after: float | None = None, **kwargs) -> Any:
+        async with self.lock:
+            if not self.auto_deferred:
+                result = await super().send_message(*args, delete_after=delete_after, **kwargs)
+                self._acknowledged()
+                return result
+
+        message = await self._parent.followup.send(*args, wait=True, **kwargs)
+        if delete_after is not None:
+            await message.delete(delay=delete_after)
+        return message
+
+    async def send_modal(self, modal: discord.ui.Modal, /) -> Any:
+        async with self.lock:
+            result = await super().send_modal(modal)
+            self._acknowledged()
+            return result
+
+class CommandTree(app_commands.CommandTree):
+    """Application command tree that profiles every invocation, acknowledges slow ones and forwards errors."""
+
+    ack_budget: float = ACK_BUDGET_SECONDS
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.budgeted = RESPONSE_SLOT in getattr(discord.Interaction, "__slots__", ())
+        if not self.budgeted:
+            logger.warning("discord.Interaction has no %s slot, slow commands will not be deferred automatically", RESPONSE_SLOT)
+
+    async def _call(self, interaction: discord.Interaction) -> None:
+        command = interaction.command
+        name = command.qualified_name if command is not None else None
+        if interaction.type is not discord.InteractionType.application_command:
+            name = None
+
+        deferral = None
+        if name is not None and self.budgeted:
+            setattr(interaction, RESPONSE_SLOT, BudgetedResponse(interaction))
+            deferral = asyncio.create_task(self._acknowledge_within_budget(interaction, command))
+
+        profile = CommandProfile()
+        with command_transaction("slash", name) as transaction:
+            try:
+                await profile.run(super()._call(interaction))
+            finally:
+                if deferral is not None:
+                    deferral.cancel()
+                    self.record_acknowledgement(interaction, name)
+                self.record(interaction, profile)
+                finish_transaction(transaction, interaction.extras.get("failed", False))
+
+    def _elapsed(self, interaction: discord.Interaction) -> float:
+        return max(time.time() - interaction.created_at.timestamp(), 0.0)
+
+    async def _acknowledge_within_budget(self, interaction: discord.Interaction, command) -> None:
+        await asyncio.sleep(max(self.ack_budget - self._elapsed(interaction), 0.0))
+        try:
+            await interaction.response.auto_defer(ephemeral=command.extras.get("ephemeral", True))
+        except discord.HTTPException as e:
+            logger.warning("Automatic deferral failed for %s: %s", command.qualified_name, e)
+
+    def record_acknowledgement(self, interaction: discord.Interaction, name: str) -> None:
+        response = interaction.response
+        acknowledged_at = response.acknowledged_at or time.time()
+        elapsed = acknowledged_at - interaction.created_at.timestamp()
+
+        if response.acknowledged_at is not None:
+            INTERACTION_ACK.observe(max(elapsed, 0.0), command=name, deferred=str(response.auto_deferred).lower())
+        if elapsed > ACK_DEADLINE_SECONDS:
+            INTERACTION_DEADLINE_MISSES.inc(command=name)
+
+    def record(self, interaction: discord.Interaction, profile: CommandProfile) -> None:
+        command = interaction.command
+        if command is None or interaction.type is not discord.InteractionType.application_command:
+            return
+
+        name = command.qualified_name
+        COMMAND_DURATION.observe(profile.wall, type="slash", command=name)
+        self.client.profiler.record("slash", name, profile)
+        if interaction.extras.get("failed"):
+            COMMAND_ERRORS.inc(type="slash", command=name)
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError) -> None:
+        interaction.extras["failed"] = True
+        self.client.dispatch("app_command_error", interaction, error)
+
+    def fingerprints(self, guild: discord.abc.Snowflake | None = None) -> dict[str, str]:
+        fingerprints = {}
+        for command in self.get_commands(guild=guild):
+            payload = command.to_dict(self)
+            key = command.name if payload.get("type", 1) == 1 else f"{command.name} ({payload['type']})"
+            fingerprints[key] = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+        return fingerprints
+
+    async def sync_changes(self, *, guild: discord.abc.Snowflake | None = None, force: bool = False) -> SyncResult:
+        """Sync only when the local tree differs from the fingerprints of the last sync stored in Redis."""
+        cache = self.client.cache
+        key = f"{TREE_FINGERPRINT_PREFIX}{guild.id if guild is not None else 'global'}"
+        local = self.fingerprints(guild)
+
+        remote = {}
+        if cache is not None:
+            stored = await cache.hgetall(key)
+            remote = {
+                (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+                for k, v in stored.items()
+            }
+
+        added = sorted(local.keys() - remote.keys())
+        removed = sorted(remote.keys() - local.keys())
+        changed = sorted(name for name in local.keys() & remote.keys() if local[name] != remote[name])
+
+        if not (added or changed or removed or force):
+            return SyncResult(False, added, changed, removed)
+
+        await self.sync(guild=guild)
+
+        if cache is not None:
+            async with cache.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                if local:
+                    pipe.hset(key, mapping=local)
+                await pipe.execute()
+
+        return SyncResult(True, added, changed, removed)
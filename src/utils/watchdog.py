@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from src.utils.logs import console_warn
+from src.utils.metrics import registry
+from src.utils.tracing import report_message
+
+WATCHDOG_INTERVAL_SECONDS = 0.25
+WATCHDOG_THRESHOLD_SECONDS = 0.5
+
+LOOP_SCHEDULING_LAG = registry.histogram(
+    "drew_event_loop_scheduling_lag_seconds",
+    "Delay between when the watchdog heartbeat was due and when it ran.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_STALLS = registry.counter(
+    "drew_event_loop_stalls_total", "Event loop stalls longer than the watchdog threshold."
+)
+
+logger = logging.getLogger("drew.bot.watchdog")
+
+class LoopWatchdog:
+    """Measures event loop lag continuously and captures the loop thread's stack when it stalls."""
+
+    def __init__(
+        self,
+        threshold: float = WATCHDOG_THRESHOLD_SECONDS,
+        interval: float = WATCHDOG_INTERVAL_SECONDS,
+    ) -> None:
+        self.threshold = threshold
+        self.interval = interval
+        self.last_beat = time.monotonic()
+        self.max_lag = 0.0
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._reported_beat = 0.0
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._beat())
+        self._thread = threading.Thread(target=self._watch, name="drew-loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _beat(self) -> None:
+        while True:
+            due = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(now - due, 0.0)
+
+            self.last_beat = now
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_SCHEDULING_LAG.observe(lag)
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.interval / 2):
+            beat = self.last_beat
+            stalled_for = time.monotonic() - beat - self.interval
+            if stalled_for < self.threshold or beat == self._reported_beat:
+                continue
+
+            self._reported_beat = beat
+            self._report(stalled_for)
+
+    def _report(self, stalled_for: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+
+        stack = traceback.extract_stack(frame)
+        location = "unknown"
+        if stack:
+            culprit = stack[-1]
+            location = f"{culprit.filename}:{culprit.lineno} in {culprit.name}"
+        formatted = "".join(traceback.format_list(stack))
+
+        LOOP_STALLS.inc()
+        console_warn(f"Event loop stalled for {stalled_for:.2f}s at {location}")
+        logger.warning("Event loop stalled for %.2fs at %s\n%s", stalled_for, location, formatted)
+
+        report_message(
+            f"Event loop stalled at {location}",
+            level="warning",
+            extras={"stalled_for": round(stalled_for, 3), "stack": formatted},
+            fingerprint=["event-loop-stall", location],
+        )
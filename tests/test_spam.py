@@ -0,0 +1,22 @@
+from src.utils.spam import CROSS_USER_DUPLICATE_LIMIT, SpamDetector
+
+GUILD_ID = 1
+
+def send_from_many(detector: SpamDetector, content: str, mentions: int = 0):
+    return [
+        detector.message(GUILD_ID, user_id, content, mentions)
+        for user_id in range(1, CROSS_USER_DUPLICATE_LIMIT + 1)
+    ]
+
+def test_short_message_from_many_users_is_allowed():
+    assert send_from_many(SpamDetector(), "gm") == [None] * CROSS_USER_DUPLICATE_LIMIT
+
+def test_long_message_from_many_users_is_flagged():
+    verdicts = send_from_many(SpamDetector(), "claim your free nitro before it runs out")
+    assert verdicts[-1] is not None
+    assert verdicts[-1].reason == "coordinated duplicate content"
+
+def test_short_link_from_many_users_is_flagged():
+    verdicts = send_from_many(SpamDetector(), "https://x.co/a")
+    assert verdicts[-1] is not None
+    assert verdicts[-1].reason == "coordinated duplicate content"